@@ -0,0 +1,149 @@
+import math
+from threading import Event
+from timeit import default_timer as timer
+from bitboard import BitBoard, iterate_bits
+from board import Board
+from move_ordering import MoveOrdering
+from node import SearchTimeout
+from othello_utils import HEURISTIC_WEIGHTS, PlayerColor
+from transposition_table import Bound, TranspositionTable
+
+# Heuristic weights of fields stored on each bit of \"BitBoard\" masks
+_BIT_WEIGHTS = [HEURISTIC_WEIGHTS[index // BitBoard.ROWS][index % BitBoard.ROWS] for index in range(BitBoard.ROWS * BitBoard.COLS)]
+
+def get_heuristic_value(board: Board, color: PlayerColor) -> int:
+    '''
+    Returns sum of heuristic weights of fields occupied by pawns of player with specified \"color\".
+    '''
+    if isinstance(board, BitBoard):
+        pawns = board.black if color == PlayerColor.BLACK else board.white
+        return sum(_BIT_WEIGHTS[index] for index in iterate_bits(pawns))
+    return sum(HEURISTIC_WEIGHTS[col][row] for col in range(board.COLS) for row in range(board.ROWS) if board[col, row] == color.value)
+
+class AlphaBetaSearch:
+    '''
+    Alpha-beta prunning implemented as recursive function over a single board, modified in place with make_move and undo_move.
+    Gives the same results as search with \"AlphaBetaNode\", but does not create any objects for searched positions.
+    Principal variation is collected in a triangular table, with a row for each level of the search.
+    '''
+    def __init__(self, player_color: PlayerColor, transposition_table: TranspositionTable = None, move_ordering: MoveOrdering = None, deadline: float = None,
+                 stop_event: Event = None) -> None:
+        self.player_color = player_color
+        self.transposition_table = transposition_table
+        self.move_ordering = move_ordering
+        self.deadline = deadline
+        self.stop_event = stop_event
+        self.nodes_count = 0
+        self.cutoffs_count = 0
+        self.__board = None
+        self.__max_depth = 0
+        self.__principal_variation = []
+
+    def search(self, board: Board, color: PlayerColor, max_depth: int) -> tuple[int, list[tuple[int, int, PlayerColor]]]:
+        '''
+        Searches position on the \"board\" with player of specified \"color\" to move, to the same depth as \"AlphaBetaNode\" with \"max_depth\".
+        Returns value of the position and principal variation - list of best moves of both players. Board is restored after the search, also if it is interrupted.
+        '''
+        self.__board = board
+        self.__max_depth = max_depth
+        self.__principal_variation = [[] for _ in range(max_depth + 1)]
+        value = self.__search(color, max_depth, -math.inf, math.inf)
+        return value, self.__principal_variation[0]
+
+    def __search(self, color: PlayerColor, depth: int, alpha: int, beta: int) -> int:
+        if (self.deadline is not None and timer() >= self.deadline) or (self.stop_event is not None and self.stop_event.is_set()):
+            raise SearchTimeout()
+        self.nodes_count += 1
+        board = self.__board
+        level = self.__max_depth - depth
+        self.__principal_variation[level] = []
+        opponent_color = PlayerColor(-color.value)
+        can_move = board.can_move(color)
+        if not can_move and not board.can_move(opponent_color):
+            return board.points[color]
+        if depth <= 1:
+            return get_heuristic_value(board, color)
+
+        key = None
+        tt_move = None
+        if self.transposition_table is not None:
+            key = TranspositionTable.get_key(board.get_hash(), color)
+            entry = self.transposition_table.lookup(key)
+            if entry is not None:
+                entry_depth, bound, value, tt_move = entry
+                # Same rules as in AlphaBetaNode - root is always searched and only searches ending with the same player to move are comparable
+                if level > 0 and entry_depth >= depth and (entry_depth - depth) % 2 == 0:
+                    if bound == Bound.EXACT:
+                        return value
+                    if bound == Bound.LOWER and value >= beta:
+                        return beta
+                    if bound == Bound.UPPER and value <= alpha:
+                        return alpha
+
+        if not can_move:
+            color, opponent_color = opponent_color, color
+
+        is_max_node = color == self.player_color
+        initial_alpha, initial_beta = alpha, beta
+        result = None
+        cutoff_action = None
+        actions = [(col, row, color) for col, row in board.get_legal_actions(color)]
+        if self.move_ordering is not None:
+            actions = self.move_ordering.order(actions, level, tt_move)
+        elif tt_move in actions:
+            actions.remove(tt_move)
+            actions.insert(0, tt_move)
+        for index, action in enumerate(actions):
+            if index == 0 or self.move_ordering is None:
+                child_result = self.__search_child(action, depth, alpha, beta)
+            elif is_max_node:
+                child_result = self.__search_child(action, depth, alpha, alpha + 1)
+                if alpha < child_result < beta:
+                    child_result = self.__search_child(action, depth, alpha, beta)
+            else:
+                child_result = self.__search_child(action, depth, beta - 1, beta)
+                if alpha < child_result < beta:
+                    child_result = self.__search_child(action, depth, alpha, beta)
+            if is_max_node:
+                if child_result > alpha:
+                    alpha = child_result
+                    self.__principal_variation[level] = [action] + self.__principal_variation[level + 1]
+                if alpha >= beta:
+                    result = beta
+                    cutoff_action = action
+                    break
+            else:
+                if child_result < beta:
+                    beta = child_result
+                    self.__principal_variation[level] = [action] + self.__principal_variation[level + 1]
+                if beta <= alpha:
+                    result = alpha
+                    cutoff_action = action
+                    break
+
+        if cutoff_action is not None:
+            self.cutoffs_count += 1
+            if self.move_ordering is not None:
+                self.move_ordering.add_cutoff(cutoff_action, level, depth)
+        if result is None:
+            result = alpha if is_max_node else beta
+        if key is not None:
+            best_moves = self.__principal_variation[level]
+            self.transposition_table.store(key, depth, self.__get_bound(result, initial_alpha, initial_beta), result, best_moves[0] if best_moves else None)
+        return result
+
+    def __search_child(self, action: tuple[int, int, PlayerColor], depth: int, alpha: int, beta: int) -> int:
+        col, row, color = action
+        self.__board.make_move(col, row, color)
+        try:
+            return self.__search(PlayerColor(-color.value), depth - 1, alpha, beta)
+        finally:
+            self.__board.undo_move()
+
+    @staticmethod
+    def __get_bound(result: int, alpha: int, beta: int) -> Bound:
+        if result <= alpha:
+            return Bound.UPPER
+        if result >= beta:
+            return Bound.LOWER
+        return Bound.EXACT
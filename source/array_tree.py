@@ -0,0 +1,281 @@
+import math
+from random import Random
+from threading import Event
+from timeit import default_timer as timer
+import numpy as np
+from batch_rollout import get_rollout_results
+from board import Board
+from othello_utils import MCTSVersion, PlayerColor
+
+class ArrayTree:
+    '''
+    MCTS tree stored as columns of preallocated numpy arrays (struct of arrays) instead of node objects. Each node is identified by its index, root has index 0.
+    Children of a node are stored in a contiguous block, reserved for all its legal moves when the node is expanded for the first time.
+    Boards are not stored in nodes - the shared board is moved along the path from the root by moves of visited nodes and restored after each iteration.
+    Search gives the same results as tree of \"MCTSNode\" objects with the same seed, for versions without grouping of states.
+    '''
+    __INITIAL_CAPACITY = 1024
+    __NO_NODE = -1
+
+    def __init__(self, board: Board, color: PlayerColor, player_color: PlayerColor, seed: int, version: MCTSVersion = MCTSVersion.UCT,
+                 rollouts_per_leaf: int = 1, capacity: int = __INITIAL_CAPACITY) -> None:
+        self.board = board
+        self.player_color = player_color
+        self.version = version
+        self.rollouts_per_leaf = rollouts_per_leaf
+        self.seed = seed
+        self._iteration_count = None
+        # Every node of \"MCTSNode\" tree starts with a new random generator with the same seed and uses it only for its first rollout
+        self.__batch_seed = Random(seed).getrandbits(32)
+        self.__size = 0
+        self.__parent = np.empty(capacity, dtype=np.int32)
+        self.__first_child = np.empty(capacity, dtype=np.int32)
+        self.__children_count = np.empty(capacity, dtype=np.int8)
+        self.__untried_count = np.empty(capacity, dtype=np.int8)
+        self.__move = np.empty(capacity, dtype=np.int8)
+        self.__move_color = np.empty(capacity, dtype=np.int8)
+        self.__color = np.empty(capacity, dtype=np.int8)
+        self.__visits = np.zeros(capacity)
+        self.__wins = np.zeros(capacity)
+        self.__draws = np.zeros(capacity)
+        self.__losses = np.zeros(capacity)
+        self.__reserve(1)
+        self.__size = 1
+        self.__create_node(0, self.__NO_NODE, self.__NO_NODE, 0, color)
+
+    def best_action(self, simulation_count: int, deadline: float = None, stop_event: Event = None) -> tuple[int, int, PlayerColor]:
+        '''
+        Returns best action for the root. Has the same limits as \"MCTSNode.best_action\", at least one simulation is always run.
+        '''
+        for i in range(simulation_count):
+            if i > 0 and ((deadline is not None and timer() >= deadline) or (stop_event is not None and stop_event.is_set())):
+                break
+            self._iteration_count = i + 1
+            node, depth = self.__tree_policy()
+            if self.rollouts_per_leaf > 1:
+                rng = np.random.default_rng(self.__batch_seed)
+                self.__backpropagate_results(node, get_rollout_results(self.board, PlayerColor(self.__color[node]), self.player_color, self.rollouts_per_leaf, rng))
+            else:
+                self.__backpropagate_results(node, {self.__rollout(node): 1})
+            for _ in range(depth):
+                self.board.undo_move()
+
+        return self.__get_action(self.__best_child_simple(0))
+
+    def get_children_statistics(self) -> list[tuple[tuple[int, int, PlayerColor], float, float]]:
+        '''
+        Returns action, number of visits and value of each child of the root.
+        '''
+        return [(self.__get_action(child), float(self.__visits[child]), float(self.__wins[child] - self.__losses[child])) for child in self.__get_children(0)]
+
+    def get_subtree(self, action: tuple[int, int, PlayerColor], board: Board, color: PlayerColor = None) -> "ArrayTree":
+        '''
+        Returns tree with root in node reached by \"action\" and opponent's reply (or pass), as \"MCTSNode.get_subtree\".
+        Tree is reduced to nodes of the subtree, so the rest of them is released and the tree should not be used for the previous position. Returns None if no such node was expanded.
+        '''
+        color = self.player_color if color is None else color
+        if action is None:
+            child = 0
+        else:
+            col, row, move_color = action
+            child = next((c for c in self.__get_children(0) if self.__get_action(c) == (col, row, move_color)), None)
+            if child is None:
+                return None
+            self.board.make_move(col, row, move_color)
+        field = board.get_field()
+        if self.board.get_field() == field and self.__color[child] == color.value:
+            return self.__compact_subtree(child)
+        for grandchild in self.__get_children(child):
+            self.board.make_move(*self.__get_action(grandchild))
+            if self.board.get_field() == field and self.__color[grandchild] == color.value:
+                return self.__compact_subtree(grandchild)
+            self.board.undo_move()
+        return None
+
+    def get_iteration_count(self) -> int:
+        '''
+        Returns number of MCTS iterations performed by the last search.
+        '''
+        return self._iteration_count
+
+    def get_tree_size(self) -> tuple[int, int]:
+        '''
+        Returns number of expanded nodes in the tree (including the root) and depth of the deepest of them.
+        '''
+        level = [0]
+        depth = 0
+        nodes_count = 1
+        while True:
+            next_level = [child for node in level for child in self.__get_children(node)]
+            if not next_level:
+                return nodes_count, depth
+            nodes_count += len(next_level)
+            depth += 1
+            level = next_level
+
+    def n(self) -> float:
+        '''
+        Returns how many times the root was visited
+        '''
+        return float(self.__visits[0])
+
+    def __create_node(self, node: int, parent: int, move: int, move_color: int, color: PlayerColor) -> None:
+        # Board has to be in position of the node. Player without moves passes, as in \"MCTSNode\"
+        untried_count = len(self.board.get_legal_actions(color))
+        if untried_count == 0:
+            color = PlayerColor(-color.value)
+            untried_count = len(self.board.get_legal_actions(color))
+        self.__parent[node] = parent
+        self.__first_child[node] = self.__NO_NODE
+        self.__children_count[node] = untried_count
+        self.__untried_count[node] = untried_count
+        self.__move[node] = move
+        self.__move_color[node] = move_color
+        self.__color[node] = color.value
+
+    def __tree_policy(self) -> tuple[int, int]:
+        node = 0
+        depth = 0
+        while self.__children_count[node] > 0:
+            if self.__untried_count[node] > 0:
+                return self.__expand(node), depth + 1
+            node = self.__best_child(node, math.sqrt(2))
+            self.board.make_move(*self.__get_action(node))
+            depth += 1
+        return node, depth
+
+    def __expand(self, node: int) -> int:
+        # Moves are taken from the end of the list of legal moves, same as untried actions of \"MCTSNode\"
+        children_count = int(self.__children_count[node])
+        if self.__first_child[node] == self.__NO_NODE:
+            self.__reserve(children_count)
+            self.__first_child[node] = self.__size
+            self.__size += children_count
+        untried_count = int(self.__untried_count[node])
+        color = PlayerColor(self.__color[node])
+        col, row = self.board.get_legal_actions(color)[untried_count - 1]
+        self.__untried_count[node] = untried_count - 1
+        child = int(self.__first_child[node]) + children_count - untried_count
+        self.board.make_move(col, row, color)
+        self.__create_node(child, node, col * self.board.ROWS + row, color.value, PlayerColor(-color.value))
+        return child
+
+    def __rollout(self, node: int) -> int:
+        random = Random(self.seed)
+        color = PlayerColor(self.__color[node])
+        board = self.board
+        moves_count = 0
+        while board.can_move(color) or board.can_move(PlayerColor(-color.value)):
+            if not board.can_move(color):
+                color = PlayerColor(-color.value)
+            possible_moves = board.get_legal_actions(color)
+            col, row = possible_moves[random.randint(0, len(possible_moves) - 1)]
+            board.make_move(col, row, color)
+            color = PlayerColor(-color.value)
+            moves_count += 1
+
+        winner_color = board.get_leader()
+        result = 0 if winner_color is None else (1 if winner_color == self.player_color else -1)
+        for _ in range(moves_count):
+            board.undo_move()
+        return result
+
+    def __backpropagate_results(self, node: int, results: dict[int, int]) -> None:
+        # Results are negated at each node with opponent of the player to move, and passed to the parent already negated, same as in \"MCTSNode\"
+        wins, draws, losses = results.get(1, 0), results.get(0, 0), results.get(-1, 0)
+        while node != self.__NO_NODE:
+            if self.__color[node] != self.player_color.value:
+                wins, losses = losses, wins
+            self.__visits[node] += wins + draws + losses
+            self.__wins[node] += wins
+            self.__draws[node] += draws
+            self.__losses[node] += losses
+            node = self.__parent[node]
+
+    def __best_child(self, node: int, c_param: float) -> int:
+        children = self.__get_children(node)
+        visits = self.__visits[children]
+        values = self.__wins[children] - self.__losses[children]
+        log_visits = np.log(self.__visits[node])
+        if self.version == MCTSVersion.UCB1_TUNED:
+            # Sum of squared rewards is equal to number of wins and losses, as draws are worth 0
+            variances = (self.__wins[children] + self.__losses[children]) / visits - (values / visits)**2 + np.sqrt(2 * log_visits / visits)
+            weights = values / visits + np.sqrt(np.minimum(1/4, variances)) * np.sqrt(log_visits / visits)
+        else:
+            weights = values / visits + c_param * np.sqrt(log_visits / visits)
+        return children.start + int(np.argmax(weights))
+
+    def __best_child_simple(self, node: int) -> int:
+        children = self.__get_children(node)
+        return children.start + int(np.argmax((self.__wins[children] - self.__losses[children]) / self.__visits[children]))
+
+    def __get_children(self, node: int) -> range:
+        # Expanded children are placed at the beginning of the block, in order of expansion
+        first_child = int(self.__first_child[node])
+        if first_child == self.__NO_NODE:
+            return range(0)
+        return range(first_child, first_child + int(self.__children_count[node] - self.__untried_count[node]))
+
+    def __get_action(self, node: int) -> tuple[int, int, PlayerColor]:
+        col, row = divmod(int(self.__move[node]), self.board.ROWS)
+        return (col, row, PlayerColor(self.__move_color[node]))
+
+    def __columns(self) -> tuple[np.ndarray, ...]:
+        # Order of columns is the same in \"__set_columns\"
+        return (self.__parent, self.__first_child, self.__children_count, self.__untried_count, self.__move, self.__move_color, self.__color,
+                self.__visits, self.__wins, self.__draws, self.__losses)
+
+    def __set_columns(self, columns: list[np.ndarray]) -> None:
+        (self.__parent, self.__first_child, self.__children_count, self.__untried_count, self.__move, self.__move_color, self.__color,
+         self.__visits, self.__wins, self.__draws, self.__losses) = columns
+
+    def __reserve(self, count: int) -> None:
+        # Capacity is at least doubled, so nodes are copied to new columns only a few times
+        capacity = len(self.__parent)
+        if self.__size + count <= capacity:
+            return
+        capacity = max(2 * capacity, self.__size + count)
+        resized_columns = []
+        for column in self.__columns():
+            resized = np.zeros(capacity, dtype=column.dtype)
+            resized[:self.__size] = column[:self.__size]
+            resized_columns.append(resized)
+        self.__set_columns(resized_columns)
+
+    def __compact_subtree(self, root: int) -> "ArrayTree":
+        # Nodes of the subtree are moved to new columns with the root at index 0, so columns of the rest of the tree can be released.
+        # Blocks of children are copied as a whole, including their not expanded nodes
+        size = 1
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            if self.__first_child[node] != self.__NO_NODE:
+                size += int(self.__children_count[node])
+                pending.extend(self.__get_children(node))
+        columns = self.__columns()
+        compacted_columns = [np.zeros(max(size, self.__INITIAL_CAPACITY), dtype=column.dtype) for column in columns]
+        parent, first_child = compacted_columns[0], compacted_columns[1]
+        for column, compacted_column in zip(columns, compacted_columns):
+            compacted_column[0] = column[root]
+        parent[0] = self.__NO_NODE
+        first_child[0] = self.__NO_NODE
+        size = 1
+        pending = [(root, 0)]
+        while pending:
+            node, compacted_node = pending.pop()
+            block_start = int(self.__first_child[node])
+            if block_start == self.__NO_NODE:
+                continue
+            children_count = int(self.__children_count[node])
+            block, compacted_block = slice(block_start, block_start + children_count), slice(size, size + children_count)
+            for column, compacted_column in zip(columns, compacted_columns):
+                compacted_column[compacted_block] = column[block]
+            parent[compacted_block] = compacted_node
+            first_child[compacted_block] = self.__NO_NODE
+            first_child[compacted_node] = size
+            pending.extend((child, size + child - block_start) for child in self.__get_children(node))
+            size += children_count
+        self.__set_columns(compacted_columns)
+        self.__size = size
+        self._iteration_count = None
+        return self
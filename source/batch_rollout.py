@@ -0,0 +1,93 @@
+import numpy as np
+from bitboard import SHIFTS, BitBoard
+from board import Board
+from othello_utils import PlayerColor
+
+# Directions are split into left and right shifts, so each half is shifted in all its directions with a single operation
+_LEFT_SHIFTS = np.array([[amount] for amount, _ in SHIFTS if amount > 0], dtype=np.uint64)
+_LEFT_MASKS = np.array([[mask] for amount, mask in SHIFTS if amount > 0], dtype=np.uint64)
+_RIGHT_SHIFTS = np.array([[-amount] for amount, _ in SHIFTS if amount < 0], dtype=np.uint64)
+_RIGHT_MASKS = np.array([[mask] for amount, mask in SHIFTS if amount < 0], dtype=np.uint64)
+_BIT_INDICES = np.arange(64, dtype=np.uint64)
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    return _POPCOUNT_TABLE[bits.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+def _get_lines(start: np.ndarray, opponent: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Returns masks of continuous lines of opponent's pawns adjacent to \"start\" fields, separately for directions shifted left and right.
+    '''
+    left = (start << _LEFT_SHIFTS) & _LEFT_MASKS & opponent
+    right = (start >> _RIGHT_SHIFTS) & _RIGHT_MASKS & opponent
+    for _ in range(5):
+        left |= (left << _LEFT_SHIFTS) & _LEFT_MASKS & opponent
+        right |= (right >> _RIGHT_SHIFTS) & _RIGHT_MASKS & opponent
+    return left, right
+
+def get_moves_masks(own: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+    '''
+    Returns masks of legal moves for each pair of \"own\" and \"opponent\" masks in the batch.
+    '''
+    left, right = _get_lines(own, opponent)
+    moves = np.bitwise_or.reduce((left << _LEFT_SHIFTS) & _LEFT_MASKS, axis=0) | np.bitwise_or.reduce((right >> _RIGHT_SHIFTS) & _RIGHT_MASKS, axis=0)
+    return moves & ~(own | opponent)
+
+def get_flips_masks(own: np.ndarray, opponent: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    '''
+    Returns masks of captured pawns for single-bit \"moves\" masks made by owner of \"own\" pawns in each game of the batch.
+    '''
+    left, right = _get_lines(moves, opponent)
+    left[((left << _LEFT_SHIFTS) & _LEFT_MASKS & own) == 0] = 0
+    right[((right >> _RIGHT_SHIFTS) & _RIGHT_MASKS & own) == 0] = 0
+    return np.bitwise_or.reduce(left, axis=0) | np.bitwise_or.reduce(right, axis=0)
+
+def play_random_games(board: Board, color: PlayerColor, games_count: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Plays \"games_count\" random games at once from position on the \"board\" with player of specified \"color\" moving first.
+    Returns final number of black and white pawns for each game.
+    '''
+    bit_board = board if isinstance(board, BitBoard) else BitBoard.from_board(board)
+    black = np.full(games_count, bit_board.black, dtype=np.uint64)
+    white = np.full(games_count, bit_board.white, dtype=np.uint64)
+    is_black_turn = np.full(games_count, color == PlayerColor.BLACK)
+    in_progress = np.ones(games_count, dtype=bool)
+
+    while in_progress.any():
+        was_black_turn = is_black_turn.copy()
+        own = np.where(was_black_turn, black, white)
+        opponent = np.where(was_black_turn, white, black)
+        moves = get_moves_masks(own, opponent)
+        has_moves = moves != 0
+
+        # Player without moves passes, game is over if the opponent has no moves either
+        passing = in_progress & ~has_moves
+        if passing.any():
+            opponent_has_moves = get_moves_masks(opponent, own) != 0
+            in_progress &= has_moves | opponent_has_moves
+            is_black_turn ^= passing & in_progress
+
+        moving = in_progress & has_moves
+        if not moving.any():
+            continue
+        # Uniformly random legal move: highest random weight among set bits of the moves mask
+        moves_bits = ((moves[moving, None] >> _BIT_INDICES) & np.uint64(1)).astype(bool)
+        weights = rng.random(moves_bits.shape) * moves_bits
+        chosen = np.uint64(1) << np.argmax(weights, axis=1).astype(np.uint64)
+        flips = get_flips_masks(own[moving], opponent[moving], chosen)
+
+        own[moving] |= flips | chosen
+        opponent[moving] ^= flips
+        black = np.where(was_black_turn, own, opponent)
+        white = np.where(was_black_turn, opponent, own)
+        is_black_turn ^= moving
+
+    return _popcount(black), _popcount(white)
+
+def get_rollout_results(board: Board, color: PlayerColor, player_color: PlayerColor, games_count: int, rng: np.random.Generator) -> dict[int, int]:
+    '''
+    Plays \"games_count\" random games from the position and returns number of wins (1), draws (0) and losses (-1) of player with \"player_color\".
+    '''
+    black_points, white_points = play_random_games(board, color, games_count, rng)
+    leader = np.sign(white_points - black_points) * player_color.value
+    return {result: int(np.count_nonzero(leader == result)) for result in (1, 0, -1)}
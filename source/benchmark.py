@@ -0,0 +1,180 @@
+import argparse
+import json
+import math
+import platform
+from datetime import datetime, timezone
+from random import Random
+from timeit import default_timer as timer
+from alpha_beta import AlphaBetaSearch
+from bitboard import convert_board
+from board import Board
+from mcts_player import MCTSPlayer
+from move_ordering import MoveOrdering
+from node import AlphaBetaNode, MCTSNode
+from othello_utils import BoardType, MCTSVersion, PlayerColor, SearchType, TreeStorage
+from state import AlphaBetaState, State
+from transposition_table import TranspositionTable
+
+# Known numbers of positions reachable from the initial position after 1, 2, ... plies, with passes counted as plies
+PERFT_RESULTS = [4, 12, 56, 244, 1396, 8200, 55092, 390216, 3005288]
+# Number of random moves played before the position searched by alpha-beta benchmark
+MIDGAME_PLIES = 20
+
+def perft(board: Board, color: PlayerColor, depth: int) -> int:
+    '''
+    Returns number of positions reached from position on the \"board\" with player of specified \"color\" to move after \"depth\" plies.
+    Pass counts as a ply and finished games are counted as reached positions. Board is restored after counting.
+    '''
+    if depth == 0:
+        return 1
+    opponent_color = PlayerColor(-color.value)
+    actions = board.get_legal_actions(color)
+    if not actions:
+        return perft(board, opponent_color, depth - 1) if board.can_move(opponent_color) else 1
+    if depth == 1:
+        return len(actions)
+    count = 0
+    for col, row in actions:
+        board.make_move(col, row, color)
+        count += perft(board, opponent_color, depth - 1)
+        board.undo_move()
+    return count
+
+def get_midgame_board(board_type: BoardType, plies: int, seed: int) -> tuple[Board, PlayerColor]:
+    '''
+    Returns board after \"plies\" random moves played from the initial position and color of the player to move.
+    The same \"seed\" always gives the same position, so results of different versions are comparable.
+    '''
+    random = Random(seed)
+    board = convert_board(Board(), board_type)
+    color = PlayerColor.BLACK
+    for _ in range(plies):
+        if not board.can_move(color):
+            color = PlayerColor(-color.value)
+        actions = board.get_legal_actions(color)
+        if not actions:
+            break
+        col, row = actions[random.randint(0, len(actions) - 1)]
+        board.move(col, row, color)
+        color = PlayerColor(-color.value)
+    return board, color
+
+def benchmark_perft(board_type: BoardType, max_depth: int) -> list[dict]:
+    '''
+    Runs perft from the initial position for depths up to \"max_depth\" and checks results against \"PERFT_RESULTS\".
+    '''
+    results = []
+    board = convert_board(Board(), board_type)
+    for depth in range(1, max_depth + 1):
+        time_start = timer()
+        nodes = perft(board, PlayerColor.BLACK, depth)
+        seconds = timer() - time_start
+        expected = PERFT_RESULTS[depth - 1] if depth <= len(PERFT_RESULTS) else None
+        results.append({'depth': depth, 'nodes': nodes, 'expected': expected, 'correct': expected is None or nodes == expected,
+                        'seconds': seconds, 'nodes_per_second': nodes / seconds})
+    return results
+
+def benchmark_rollouts(board_type: BoardType, rollouts_count: int, seed: int) -> dict:
+    '''
+    Plays \"rollouts_count\" random games from the initial position, one by one and all at once by the batched rollout engine.
+    '''
+    node = MCTSNode(State(convert_board(Board(), board_type), PlayerColor.BLACK), PlayerColor.BLACK, seed, rollouts_per_leaf=rollouts_count)
+    time_start = timer()
+    for _ in range(rollouts_count):
+        node._rollout()
+    seconds = timer() - time_start
+    time_start = timer()
+    node._batch_rollout()
+    batch_seconds = timer() - time_start
+    return {'rollouts': rollouts_count, 'seconds': seconds, 'rollouts_per_second': rollouts_count / seconds,
+            'batched_seconds': batch_seconds, 'batched_rollouts_per_second': rollouts_count / batch_seconds}
+
+def benchmark_mcts(board_type: BoardType, simulation_count: int, seed: int) -> list[dict]:
+    '''
+    Runs a single search of \"simulation_count\" iterations from the initial position for each version of MCTS and each storage of the tree.
+    '''
+    results = []
+    for version in MCTSVersion:
+        for tree_storage in TreeStorage:
+            player = MCTSPlayer(PlayerColor.BLACK, seed, simulation_count, version, board_type, reuse_tree=False, tree_storage=tree_storage)
+            tree_root, iterations = player._create_tree(convert_board(Board(), board_type), seed, {})
+            time_start = timer()
+            tree_root.best_action(iterations)
+            seconds = timer() - time_start
+            iterations = tree_root.get_iteration_count()
+            results.append({'version': version.name, 'tree_storage': tree_storage.value, 'iterations': iterations, 'seconds': seconds,
+                            'iterations_per_second': iterations / seconds})
+    return results
+
+def benchmark_alpha_beta(board_type: BoardType, max_depth: int, seed: int) -> list[dict]:
+    '''
+    Searches a midgame position to depths from 2 up to \"max_depth\" with both types of alpha-beta search, without and with transposition table and move ordering.
+    Initial position is not used, as its searches are too small to be measured.
+    '''
+    results = []
+    for search_type in SearchType:
+        for is_enhanced in (False, True):
+            for depth in range(2, max_depth + 1):
+                transposition_table = TranspositionTable(100000) if is_enhanced else None
+                move_ordering = MoveOrdering() if is_enhanced else None
+                board, color = get_midgame_board(board_type, MIDGAME_PLIES, seed)
+                time_start = timer()
+                if search_type == SearchType.RECURSIVE:
+                    search = AlphaBetaSearch(color, transposition_table, move_ordering)
+                    search.search(board, color, depth)
+                    nodes = search.nodes_count
+                else:
+                    tree_root = AlphaBetaNode(AlphaBetaState(board, color), color, depth, -math.inf, math.inf,
+                                              transposition_table = transposition_table, move_ordering = move_ordering)
+                    tree_root.best_action()
+                    nodes = tree_root.nodes_count
+                seconds = timer() - time_start
+                results.append({'search_type': search_type.value, 'enhanced': is_enhanced, 'depth': depth, 'nodes': nodes, 'seconds': seconds,
+                                'nodes_per_second': nodes / seconds})
+    return results
+
+def main():
+    '''
+    Entry point of the benchmark. Measures speed of move generation, rollouts, MCTS and alpha-beta search and writes results to JSON file.
+    Results of perft are checked against known numbers, so the benchmark fails if move generation is broken.
+    '''
+    parser = argparse.ArgumentParser(description='Measures speed of Othello engines.')
+    parser.add_argument('--output', default='benchmark.json', help='Path to JSON file overwritten with results. Default: benchmark.json.')
+    parser.add_argument('--board-type', default=BoardType.BITBOARD.value, choices=[board_type.value for board_type in BoardType],
+                        help='Representation of the board used by all benchmarks. Default: bitboard.')
+    parser.add_argument('--perft-depth', type=int, default=7, help='Maximum depth of perft. Default: 7.')
+    parser.add_argument('--rollouts', type=int, default=1000, help='Number of random games played by rollout benchmark. Default: 1000.')
+    parser.add_argument('--simulations', type=int, default=500, help='Number of MCTS iterations run for each version. Default: 500.')
+    parser.add_argument('--alpha-beta-depth', type=int, default=6, help='Maximum depth of alpha-beta search. Default: 6.')
+    parser.add_argument('--seed', type=int, default=10, help='Seed used by MCTS, rollouts and for choosing position searched by alpha-beta. Default: 10.')
+    args = parser.parse_args()
+    board_type = BoardType(args.board_type)
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'board_type': board_type.value,
+        'perft': benchmark_perft(board_type, args.perft_depth),
+        'rollouts': benchmark_rollouts(board_type, args.rollouts, args.seed),
+        'mcts': benchmark_mcts(board_type, args.simulations, args.seed),
+        'alpha_beta': benchmark_alpha_beta(board_type, args.alpha_beta_depth, args.seed)
+    }
+    with open(args.output, 'w', encoding='utf8') as output_file:
+        json.dump(results, output_file, indent=4)
+
+    for result in results['perft']:
+        status = 'ok' if result['correct'] else f'expected {result["expected"]}'
+        print(f'Perft {result["depth"]}: {result["nodes"]} nodes ({status}), {result["nodes_per_second"]:.0f} nodes/s')
+    rollouts = results['rollouts']
+    print(f'Rollouts: {rollouts["rollouts_per_second"]:.1f}/s, batched: {rollouts["batched_rollouts_per_second"]:.1f}/s')
+    for result in results['mcts']:
+        print(f'MCTS {result["version"]} ({result["tree_storage"]}): {result["iterations_per_second"]:.1f} iterations/s')
+    for result in results['alpha_beta']:
+        print(f'Alpha-beta {result["search_type"]}{" with TT and ordering" if result["enhanced"] else ""}, depth {result["depth"]}: '
+              f'{result["nodes"]} nodes, {result["nodes_per_second"]:.0f} nodes/s')
+    if not all(result['correct'] for result in results['perft']):
+        raise Exception('Perft results differ from known numbers, move generation is broken')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+from board import Board
+from othello_utils import ZOBRIST_FLIP_KEYS, ZOBRIST_KEYS, ZOBRIST_LANE_MASK, BoardType, PlayerColor, get_canonical_key, rotated
+
+FULL_MASK = 0xFFFFFFFFFFFFFFFF
+NOT_ROW_0 = 0xFEFEFEFEFEFEFEFE
+NOT_ROW_7 = 0x7F7F7F7F7F7F7F7F
+
+# Square (col, row) is stored on bit col * 8 + row, so iterating over set bits from the lowest one
+# visits fields in the same column-major order as Board.get_legal_actions.
+# Each direction is described by shift amount (positive means left shift) and mask removing fields wrapped to the other edge.
+SHIFTS = (
+    (-1, NOT_ROW_7), # NORTH
+    (7, NOT_ROW_7),  # NORTH_EAST
+    (8, FULL_MASK),  # EAST
+    (9, NOT_ROW_0),  # SOUTH_EAST
+    (1, NOT_ROW_0),  # SOUTH
+    (-7, NOT_ROW_0), # SOUTH_WEST
+    (-8, FULL_MASK), # WEST
+    (-9, NOT_ROW_7), # NORTH_WEST
+)
+
+def shift(bits: int, amount: int, mask: int) -> int:
+    '''
+    Returns \"bits\" shifted by \"amount\" fields in one of the directions defined in SHIFTS.
+    '''
+    if amount > 0:
+        return (bits << amount) & mask
+    return (bits >> -amount) & mask
+
+def get_moves_mask(own: int, opponent: int) -> int:
+    '''
+    Returns mask of all fields where player owning \"own\" pawns can legally place a pawn.
+    '''
+    empty = ~(own | opponent) & FULL_MASK
+    moves = 0
+    for amount, mask in SHIFTS:
+        candidates = shift(own, amount, mask) & opponent
+        for _ in range(5):
+            candidates |= shift(candidates, amount, mask) & opponent
+        moves |= shift(candidates, amount, mask) & empty
+    return moves
+
+def get_flips_mask(own: int, opponent: int, move: int) -> int:
+    '''
+    Returns mask of opponent's pawns captured by placing pawn on field represented by single-bit \"move\" mask.
+    '''
+    flips = 0
+    for amount, mask in SHIFTS:
+        line = 0
+        field = shift(move, amount, mask)
+        while field & opponent:
+            line |= field
+            field = shift(field, amount, mask)
+        if field & own:
+            flips |= line
+    return flips
+
+def iterate_bits(bits: int):
+    '''
+    Yields indices of all set bits, starting from the lowest one.
+    '''
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+class BitBoard:
+    '''
+    Drop-in replacement for \"Board\" class storing pawns of each player as 64-bit integers.
+    Legal actions and captures are calculated with shift-based operations on whole board at once.
+    '''
+    ROWS, COLS = Board.ROWS, Board.COLS
+
+    def __init__(self) -> None:
+        self.black = 0
+        self.white = 0
+        self.__history = []
+        self.__legal_actions = {}
+        self.__hash = 0
+        self.__init_board()
+
+    @staticmethod
+    def from_board(board: Board) -> "BitBoard":
+        '''
+        Returns new instance of \"BitBoard\" with the same position and result as \"board\".
+        '''
+        bit_board = BitBoard()
+        bit_board.set_field(board.get_field())
+        return bit_board
+
+    def evaluate_move(self, col: int, row: int, color: PlayerColor) -> int:
+        '''
+        Returns number of pawns captured by placing pawn of specific color in specified row and col of the board
+        If the move is illegal, returns -1
+        '''
+        move = 1 << (col * self.ROWS + row)
+        if (self.black | self.white) & move:
+            return -1
+        own, opponent = self.__get_masks(color)
+        value = get_flips_mask(own, opponent, move).bit_count()
+        return value if value > 0 else -1
+
+    def get_captures(self, col: int, row: int, color: PlayerColor) -> list[tuple[int, int]]:
+        '''
+        Returns list of (row, col)-coordinates for all pawns that will be captured by placing pawn of specific color in specified row and col of the board
+        '''
+        move = 1 << (col * self.ROWS + row)
+        if (self.black | self.white) & move:
+            return []
+        own, opponent = self.__get_masks(color)
+        return [divmod(index, self.ROWS) for index in iterate_bits(get_flips_mask(own, opponent, move))]
+
+    def get_legal_actions(self, player_color: PlayerColor) -> list[tuple[int, int]]:
+        '''
+        Returns list of (row, col)-coordinates for all fields where pawn of specified color can be legally placed
+        Result is cached until the board is modified, so returned list must not be modified.
+        '''
+        moves = self.__legal_actions.get(player_color)
+        if moves is None:
+            own, opponent = self.__get_masks(player_color)
+            moves = [divmod(index, self.ROWS) for index in iterate_bits(get_moves_mask(own, opponent))]
+            self.__legal_actions[player_color] = moves
+        return moves
+
+    def refresh_result(self) -> bool:
+        '''
+        Refreshes result stored in points array, counting pawns placed on the board
+        Result is kept up to date by all methods modifying the board, so this method serves only as a consistency check.
+        Returns true if the stored result was already correct.
+        '''
+        points = dict(self.points)
+        self.__count_points()
+        return points == self.points
+
+    def can_move(self, color: PlayerColor) -> bool:
+        '''
+        Returns boolean value indicating if there is any legal move for player with specified color
+        Result is cached until the board is modified.
+        '''
+        return len(self.get_legal_actions(color)) > 0
+
+    def move(self, col: int, row: int, color: PlayerColor) -> bool:
+        '''
+        If legal, update board fields with results of placing a pawn of specific color in specified row and col of the board.
+        Returns true if move was possible or false if it was illegal. Result stored in points array is updated by this method.
+        '''
+        move = 1 << (col * self.ROWS + row)
+        if (self.black | self.white) & move:
+            return False
+        own, opponent = self.__get_masks(color)
+        flips = get_flips_mask(own, opponent, move)
+        if flips == 0:
+            return False
+        self.__place_pawn(move, flips, color, own, opponent)
+        return True
+
+    def make_move(self, col: int, row: int, color: PlayerColor) -> bool:
+        '''
+        If legal, places a pawn of specific color in specified row and col of the board and records captured pawns, so the move can be reverted with undo_move method.
+        Returns true if move was possible or false if it was illegal. Result stored in points array is updated by this method.
+        '''
+        move = 1 << (col * self.ROWS + row)
+        if (self.black | self.white) & move:
+            return False
+        own, opponent = self.__get_masks(color)
+        flips = get_flips_mask(own, opponent, move)
+        if flips == 0:
+            return False
+        self.__history.append((move, flips, color, self.__legal_actions, self.__hash))
+        self.__place_pawn(move, flips, color, own, opponent)
+        return True
+
+    def undo_move(self) -> None:
+        '''
+        Reverts the last move done with make_move method, including the result stored in points array, hash and cached legal actions.
+        '''
+        move, flips, color, self.__legal_actions, self.__hash = self.__history.pop()
+        own, opponent = self.__get_masks(color)
+        self.__set_masks(color, own ^ (flips | move), opponent | flips)
+        captures_count = flips.bit_count()
+        self.points[color] -= captures_count + 1
+        self.points[PlayerColor(-color.value)] += captures_count
+
+    def copy(self) -> "BitBoard":
+        '''
+        Returns copy of the board with the same position and result, without history of moves and cached legal actions.
+        '''
+        board = BitBoard()
+        board.black, board.white = self.black, self.white
+        board.points = dict(self.points)
+        board.__hash = self.__hash
+        return board
+
+    def get_hash(self) -> int:
+        '''
+        Returns Zobrist hash of the position, updated incrementally with each modification of the board.
+        '''
+        return self.__hash & ZOBRIST_LANE_MASK
+
+    def get_canonical_key(self) -> int:
+        '''
+        Returns key of the position, identical for all its rotations and reflections.
+        '''
+        return get_canonical_key(self.__hash)
+
+    def get_field(self) -> list[list[int]]:
+        '''
+        Returns color values of pawns placed on all fields on the board.
+        '''
+        return [[self[col, row] for row in range(self.ROWS)] for col in range(self.COLS)]
+
+    def set_field(self, field: list[list[int]]) -> None:
+        '''
+        Overwrites current board with color values of pawns from \"field\" and updates the result.
+        '''
+        self.black = self.white = 0
+        self.__legal_actions = {}
+        for col in range(self.COLS):
+            for row in range(self.ROWS):
+                if field[col][row] == PlayerColor.BLACK.value:
+                    self.black |= 1 << (col * self.ROWS + row)
+                elif field[col][row] == PlayerColor.WHITE.value:
+                    self.white |= 1 << (col * self.ROWS + row)
+        self.__count_points()
+        self.__refresh_hash()
+
+    def rotate_board(self) -> None:
+        '''
+        Overwrites current board by rotating it
+        '''
+        self.set_field(rotated(self.get_field()))
+
+    def get_leader(self) -> PlayerColor:
+        '''
+        Return leader's color
+        '''
+        if self.points[PlayerColor.BLACK] == self.points[PlayerColor.WHITE]:
+            return None
+        if self.points[PlayerColor.BLACK] > self.points[PlayerColor.WHITE]:
+            return PlayerColor.BLACK
+        return PlayerColor.WHITE
+
+    def __init_board(self) -> None:
+        center_row, center_col = self.ROWS // 2, self.COLS // 2
+        self.white = (1 << ((center_col - 1) * self.ROWS + center_row - 1)) | (1 << (center_col * self.ROWS + center_row))
+        self.black = (1 << ((center_col - 1) * self.ROWS + center_row)) | (1 << (center_col * self.ROWS + center_row - 1))
+        self.points = { PlayerColor.BLACK: 2, PlayerColor.WHITE: 2}
+        self.__refresh_hash()
+
+    def __place_pawn(self, move: int, flips: int, color: PlayerColor, own: int, opponent: int) -> None:
+        self.__set_masks(color, own | flips | move, opponent ^ flips)
+        for index in iterate_bits(flips):
+            self.__hash ^= ZOBRIST_FLIP_KEYS[index]
+        self.__hash ^= ZOBRIST_KEYS[color.value][move.bit_length() - 1]
+        captures_count = flips.bit_count()
+        self.points[color] += captures_count + 1
+        self.points[PlayerColor(-color.value)] -= captures_count
+        self.__legal_actions = {}
+
+    def __count_points(self) -> None:
+        self.points[PlayerColor.BLACK] = self.black.bit_count()
+        self.points[PlayerColor.WHITE] = self.white.bit_count()
+
+    def __refresh_hash(self) -> None:
+        self.__hash = 0
+        for index in iterate_bits(self.black):
+            self.__hash ^= ZOBRIST_KEYS[PlayerColor.BLACK.value][index]
+        for index in iterate_bits(self.white):
+            self.__hash ^= ZOBRIST_KEYS[PlayerColor.WHITE.value][index]
+
+    def __get_masks(self, color: PlayerColor) -> tuple[int, int]:
+        if color == PlayerColor.BLACK:
+            return self.black, self.white
+        return self.white, self.black
+
+    def __set_masks(self, color: PlayerColor, own: int, opponent: int) -> None:
+        if color == PlayerColor.BLACK:
+            self.black, self.white = own, opponent
+        else:
+            self.white, self.black = own, opponent
+
+    def __getitem__(self, key: tuple[int, int]) -> int:
+        bit = 1 << (key[0] * self.ROWS + key[1])
+        if self.black & bit:
+            return PlayerColor.BLACK.value
+        if self.white & bit:
+            return PlayerColor.WHITE.value
+        return 0
+
+    def __setitem__(self, key: tuple[int, int], value: int) -> None:
+        bit = 1 << (key[0] * self.ROWS + key[1])
+        self.black &= ~bit
+        self.white &= ~bit
+        if value == PlayerColor.BLACK.value:
+            self.black |= bit
+        elif value == PlayerColor.WHITE.value:
+            self.white |= bit
+        self.__legal_actions = {}
+        self.__count_points()
+        self.__refresh_hash()
+
+    def __delitem__(self, key: tuple[int, int]) -> None:
+        bit = 1 << (key[0] * self.ROWS + key[1])
+        self.black &= ~bit
+        self.white &= ~bit
+        self.__legal_actions = {}
+        self.__count_points()
+        self.__refresh_hash()
+
+def convert_board(board: Board, board_type: BoardType) -> Board:
+    '''
+    Returns \"board\" in representation specified by \"board_type\". Board is not copied if no conversion is required.
+    '''
+    if board_type == BoardType.BITBOARD and not isinstance(board, BitBoard):
+        return BitBoard.from_board(board)
+    return board
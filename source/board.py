@@ -1,5 +1,5 @@
 from typing import Generator
-from othello_utils import Direction, PlayerColor, rotated
+from othello_utils import ZOBRIST_FLIP_KEYS, ZOBRIST_KEYS, ZOBRIST_LANE_MASK, Direction, PlayerColor, get_canonical_key, get_zobrist_hash, rotated
 
 class Board:
     '''
@@ -10,6 +10,10 @@ class Board:
 
     def __init__(self) -> None:
         self.__field = [[]]
+        self.__history = []
+        self.__legal_actions = {}
+        self.__can_move = {}
+        self.__hash = 0
         self.__init_board()
 
     def evaluate_move(self, col: int, row: int, color: PlayerColor) -> int:
@@ -34,50 +38,110 @@ class Board:
     def get_legal_actions(self, player_color: PlayerColor) -> list[tuple[int, int]]:
         '''
         Returns list of (row, col)-coordinates for all fields where pawn of specified color can be legally placed
+        Result is cached until the board is modified, so returned list must not be modified.
         '''
+        moves = self.__legal_actions.get(player_color)
+        if moves is not None:
+            return moves
         moves = []
         for i in range(self.COLS):
             for j in range(self.ROWS):
                 if self.evaluate_move(i, j, player_color) > 0:
                     moves.append((i,j))
+        self.__legal_actions[player_color] = moves
         return moves
 
-    def refresh_result(self) -> None:
+    def refresh_result(self) -> bool:
         '''
         Refreshes result stored in points array, counting pawns placed on the board
+        Result is kept up to date by all methods modifying the board, so this method serves only as a consistency check.
+        Returns true if the stored result was already correct.
         '''
-        self.points[PlayerColor.BLACK] = self.points[PlayerColor.WHITE] = 0
+        points = { PlayerColor.BLACK: 0, PlayerColor.WHITE: 0}
         for i in range(self.COLS):
             for j in range(self.ROWS):
                 if self.__field[i][j] != 0:
-                    self.points[PlayerColor(self.__field[i][j])] += 1
+                    points[PlayerColor(self.__field[i][j])] += 1
+        is_consistent = points == self.points
+        self.points.update(points)
+        return is_consistent
 
     def can_move(self, color: PlayerColor) -> bool:
         '''
         Returns boolean value indicating if there is any legal move for player with specified color
+        Result is cached until the board is modified.
         '''
         if self.points[PlayerColor.BLACK] + self.points[PlayerColor.WHITE] == 64:
             return False
+        if color in self.__legal_actions:
+            return len(self.__legal_actions[color]) > 0
+        if color in self.__can_move:
+            return self.__can_move[color]
 
+        self.__can_move[color] = False
         for col in range(self.COLS):
             for row in range(self.ROWS):
                 if self.__field[col][row] == 0 and self.evaluate_move(col, row, color) > 0:
+                    self.__can_move[color] = True
                     return True
         return False
 
     def move(self, col: int, row: int, color: PlayerColor) -> bool:
         '''
         If legal, update board fields with results of placing a pawn of specific color in specified row and col of the board.
-        Returns true if move was possible or false if it was illegal.
-        Result is not updated by this method. It has to be done manually by calling refresh_result method.
+        Returns true if move was possible or false if it was illegal. Result stored in points array is updated by this method.
         '''
-        if self.evaluate_move(col, row, color) < 0:
+        captures = self.get_captures(col, row, color)
+        if len(captures) == 0:
             return False
-        for capture in self.get_captures(col, row, color):
-            self.__field[capture[0]][capture[1]] = color.value
-        self.__field[col][row] = color.value
+        self.__place_pawn(col, row, color, captures)
         return True
 
+    def make_move(self, col: int, row: int, color: PlayerColor) -> bool:
+        '''
+        If legal, places a pawn of specific color in specified row and col of the board and records captured pawns, so the move can be reverted with undo_move method.
+        Returns true if move was possible or false if it was illegal. Result stored in points array is updated by this method.
+        '''
+        captures = self.get_captures(col, row, color)
+        if len(captures) == 0:
+            return False
+        self.__history.append((col, row, color, captures, self.__legal_actions, self.__can_move, self.__hash))
+        self.__place_pawn(col, row, color, captures)
+        return True
+
+    def undo_move(self) -> None:
+        '''
+        Reverts the last move done with make_move method, including the result stored in points array, hash and cached legal actions.
+        '''
+        col, row, color, captures, self.__legal_actions, self.__can_move, self.__hash = self.__history.pop()
+        for capture in captures:
+            self.__field[capture[0]][capture[1]] = -color.value
+        self.__field[col][row] = 0
+        self.points[color] -= len(captures) + 1
+        self.points[PlayerColor(-color.value)] += len(captures)
+
+    def copy(self) -> "Board":
+        '''
+        Returns copy of the board with the same position and result, without history of moves and cached legal actions.
+        '''
+        board = Board()
+        board.__field = [column[:] for column in self.__field]
+        board.points = dict(self.points)
+        board.__hash = self.__hash
+        return board
+
+    def get_hash(self) -> int:
+        '''
+        Returns Zobrist hash of the position, updated incrementally with each modification of the board.
+        '''
+        return self.__hash & ZOBRIST_LANE_MASK
+
+    def get_canonical_key(self) -> int:
+        '''
+        Returns key of the position, identical for all its rotations and reflections.
+        '''
+        return get_canonical_key(self.__hash)
+
     def get_field(self) -> list[list[int]]:
         '''
         Returns color values of pawns placed on all fields on the board.
@@ -89,6 +153,8 @@ class Board:
         Overwrites current board by rotating it
         '''
         self.__field = rotated(self.__field)
+        self.__hash = get_zobrist_hash(self.__field)
+        self.__clear_cache()
 
     def get_leader(self) -> PlayerColor:
         '''
@@ -106,6 +172,32 @@ class Board:
         self.__field[center_col - 1][center_row - 1] = self.__field[center_col][center_row] = 1
         self.__field[center_col - 1][center_row] = self.__field[center_col][center_row - 1] = -1
         self.points = { PlayerColor.BLACK: 2, PlayerColor.WHITE: 2}
+        self.__hash = get_zobrist_hash(self.__field)
+
+    def __place_pawn(self, col: int, row: int, color: PlayerColor, captures: list[tuple[int, int]]) -> None:
+        for capture in captures:
+            self.__field[capture[0]][capture[1]] = color.value
+            self.__hash ^= ZOBRIST_FLIP_KEYS[capture[0] * self.ROWS + capture[1]]
+        self.__field[col][row] = color.value
+        self.__hash ^= ZOBRIST_KEYS[color.value][col * self.ROWS + row]
+        self.points[color] += len(captures) + 1
+        self.points[PlayerColor(-color.value)] -= len(captures)
+        self.__clear_cache()
+
+    def __update_field(self, col: int, row: int, new_value: int) -> None:
+        old_value = self.__field[col][row]
+        if old_value != 0:
+            self.points[PlayerColor(old_value)] -= 1
+            self.__hash ^= ZOBRIST_KEYS[old_value][col * self.ROWS + row]
+        if new_value != 0:
+            self.points[PlayerColor(new_value)] += 1
+            self.__hash ^= ZOBRIST_KEYS[new_value][col * self.ROWS + row]
+        self.__field[col][row] = new_value
+        self.__clear_cache()
+
+    def __clear_cache(self) -> None:
+        self.__legal_actions = {}
+        self.__can_move = {}
 
     def __get_captures_in_direction(self, col: int, row: int, direction: Direction, player: PlayerColor) -> tuple[int, int]:
         captures = []
@@ -152,8 +244,7 @@ class Board:
         return self.__field[key[0]][key[1]]
 
     def __setitem__(self, key: tuple[int, int], value: int) -> None:
-        self.__field[key[0]][key[1]] = value
-        self.refresh_result()
+        self.__update_field(key[0], key[1], value)
 
     def __delitem__(self, key: tuple[int, int]) -> None:
-        self.__field[key[0]][key[1]] = 0
+        self.__update_field(key[0], key[1], 0)
@@ -1,8 +1,9 @@
 from enum import Enum
 import json
+import os
 from random import Random
 from heuristic_player import AlphaBetaHeuristicPlayer, SimpleHeuristicPlayer
-from othello_utils import MCTSVersion, PlayerColor
+from othello_utils import BoardType, MCTSVersion, ParallelMode, PlayerColor, SearchType, TreeStorage
 from match import Match
 from player import Player, RandomPlayer, UserPlayer
 from mcts_player import MCTSPlayer
@@ -40,8 +41,13 @@ class PlayerConfig():
     def __init__(self, parsed_config: dict) -> None:
         self.type = PlayerConfig.PlayerType(parsed_config["player_type"])
         self.color = PlayerConfig.PlayerColor(parsed_config["player_color"]) if "player_color" in parsed_config else None
+        self.workers = parsed_config.get("workers", 1)
+        self.parallel_mode = ParallelMode(parsed_config.get("parallel_mode", ParallelMode.ROOT.value))
 
-    def to_game_player(self, color: "PlayerConfig.PlayerColor" = None, seed: int = None, simulation_depth: int = 5, simulation_count: int = 500) -> Player:
+    def to_game_player(self, color: "PlayerConfig.PlayerColor" = None, seed: int = None, simulation_depth: int = 5, simulation_count: int = 500,
+                       board_type: BoardType = BoardType.LIST, rollouts_per_leaf: int = 1, reuse_tree: bool = True, transposition_table_size: int = 100000,
+                       move_time_ms: int = None, game_time_ms: int = None, move_ordering: bool = True,
+                       search_type: SearchType = SearchType.RECURSIVE, tree_storage: TreeStorage = TreeStorage.OBJECTS) -> Player:
         '''
         Returns instance of class derived from \"Player\", created based on configuraiton.
         '''
@@ -52,17 +58,21 @@ class PlayerConfig():
             case PlayerConfig.PlayerType.USER:
                 return UserPlayer(player_color)
             case PlayerConfig.PlayerType.SIMPLE_HEURISTIC:
-                return SimpleHeuristicPlayer(player_color)
+                return SimpleHeuristicPlayer(player_color, board_type)
             case PlayerConfig.PlayerType.HEURISTIC:
-                return AlphaBetaHeuristicPlayer(player_color, simulation_depth)
+                return AlphaBetaHeuristicPlayer(player_color, simulation_depth, board_type, transposition_table_size, move_time_ms, game_time_ms,
+                                                move_ordering, search_type)
             case PlayerConfig.PlayerType.RANDOM:
-                return RandomPlayer(player_color, seed)
+                return RandomPlayer(player_color, seed, board_type)
             case PlayerConfig.PlayerType.MCTS:
-                return MCTSPlayer(player_color, seed, simulation_count, MCTSVersion.UCT)
+                return MCTSPlayer(player_color, seed, simulation_count, MCTSVersion.UCT, board_type, rollouts_per_leaf, self.workers, self.parallel_mode, reuse_tree,
+                                  move_time_ms, game_time_ms, tree_storage)
             case PlayerConfig.PlayerType.MCTS_UCB:
-                return MCTSPlayer(player_color, seed, simulation_count, MCTSVersion.UCB1_TUNED)
+                return MCTSPlayer(player_color, seed, simulation_count, MCTSVersion.UCB1_TUNED, board_type, rollouts_per_leaf, self.workers, self.parallel_mode, reuse_tree,
+                                  move_time_ms, game_time_ms, tree_storage)
             case PlayerConfig.PlayerType.MCTS_GROUPING:
-                return MCTSPlayer(player_color, seed, simulation_count, MCTSVersion.UCT_GROUPING)
+                return MCTSPlayer(player_color, seed, simulation_count, MCTSVersion.UCT_GROUPING, board_type, rollouts_per_leaf, self.workers, self.parallel_mode, reuse_tree,
+                                  move_time_ms, game_time_ms, tree_storage)
 
 class ConfigModel:
     '''
@@ -73,9 +83,22 @@ class ConfigModel:
         self.show_visualization = parsed_config.get("show_visualization", True)
         self.output_file = parsed_config.get("output_file", None)
         self.game_repetitions = parsed_config.get("game_repetitions", 1)
+        self.tournament_workers = parsed_config.get("tournament_workers", 1)
         self.seed = parsed_config.get("seed", None)
         self.heurstic_simulation_depth = parsed_config.get("heurstic_simulation_depth", 10)
+        self.heuristic_transposition_table_size = parsed_config.get("heuristic_transposition_table_size", 100000)
+        self.heuristic_move_ordering = parsed_config.get("heuristic_move_ordering", True)
+        self.heuristic_search_type = SearchType(parsed_config.get("heuristic_search_type", SearchType.RECURSIVE.value))
         self.mcts_simulation_count = parsed_config.get("mcts_simulation_count", 500)
+        self.mcts_rollouts_per_leaf = parsed_config.get("mcts_rollouts_per_leaf", 1)
+        self.mcts_reuse_tree = parsed_config.get("mcts_reuse_tree", True)
+        self.mcts_tree_storage = TreeStorage(parsed_config.get("mcts_tree_storage", TreeStorage.OBJECTS.value))
+        self.board_type = BoardType(parsed_config.get("board_type", BoardType.LIST.value))
+        self.move_time_ms = parsed_config.get("move_time_ms", None)
+        self.game_time_ms = parsed_config.get("game_time_ms", None)
+        self.ponder = parsed_config.get("ponder", False)
+        self.telemetry = parsed_config.get("telemetry", False)
+        self.profile_move = parsed_config.get("profile_move", None)
 
         self.__players = [PlayerConfig(player) for player in parsed_config["players"]]
         self.__ignore_player_colors = (self.game_type == GameType.TOURNAMENT
@@ -112,7 +135,23 @@ class ConfigModel:
         return matches
 
     def __get_game_player(self, index: int, seed: int, color: PlayerConfig.PlayerColor) -> Player:
-        return self.__players[index].to_game_player(color, seed, self.heurstic_simulation_depth, self.mcts_simulation_count)
+        return self.__players[index].to_game_player(color, seed, self.heurstic_simulation_depth, self.mcts_simulation_count, self.board_type, self.mcts_rollouts_per_leaf, self.mcts_reuse_tree,
+                                                     self.heuristic_transposition_table_size, self.move_time_ms, self.game_time_ms, self.heuristic_move_ordering,
+                                                     self.heuristic_search_type, self.mcts_tree_storage)
+
+    def get_telemetry_file(self) -> str:
+        '''
+        Returns path to file with statistics of moves, next to the output file, or None if they should not be saved.
+        '''
+        if not self.telemetry or not self.output_file:
+            return None
+        return f'{os.path.splitext(self.output_file)[0]}-telemetry.jsonl'
+
+    def get_profile_prefix(self) -> str:
+        '''
+        Returns beginning of paths of files with profiles of moves, next to the output file if it is set.
+        '''
+        return f'{os.path.splitext(self.output_file)[0]}-profile' if self.output_file else 'profile'
 
     @staticmethod
     def get_from_file(file_name: str) -> "ConfigModel":
@@ -0,0 +1,152 @@
+import math
+import pygame
+from board import Board
+from othello_utils import PlayerColor
+
+class GameRenderer:
+    '''
+    Class drawing the board and game results in pygame window and handling user's input.
+    Only module of the game using pygame, so it is imported only if the window has to be opened.
+    Rendered texts are cached and only changed regions of the window are redrawn.
+    '''
+    __WIDTH, __HEIGHT = 800, 600
+    __BG_COLOR = (0,100,0)
+    # Line below is required to ignore pylint's fake-error from pygame module
+    # pylint: disable=maybe-no-member
+    __NOTIFY_EVENT = pygame.USEREVENT
+
+    def __init__(self, rows: int, cols: int) -> None:
+        self.__rows = rows
+        self.__cols = cols
+        self.__field_size = self.__HEIGHT / rows
+        # Line below is required to ignore pylint's fake-error from pygame module
+        # pylint: disable=maybe-no-member
+        pygame.init()
+        pygame.display.set_caption("Othello")
+        self.__font = pygame.font.SysFont('comicsans', 30)
+        self.__window = pygame.display.set_mode((self.__WIDTH, self.__HEIGHT))
+        # Rendered texts, fields and results drawn last time, so only changes are redrawn
+        self.__glyphs = {}
+        self.__drawn_fields = {}
+        self.__drawn_results = None
+        self.__drawn_hash = None
+        self.__is_redraw_needed = True
+
+    def process_events(self, wait: bool = False) -> tuple[bool, list[tuple[int, int]]]:
+        '''
+        Processes pending window events. Returns True if window was closed and (col, row)-coordinates of all fields clicked by the user.
+        If \"wait\" is set, blocks until at least one event (including notification sent with \"notify\" method) is received.
+        '''
+        is_closed = False
+        clicked_fields = []
+        events = pygame.event.get()
+        if wait and not events:
+            events = [pygame.event.wait()]
+        for event in events:
+            # Line below is required to ignore pylint's fake-error from pygame module
+            # pylint: disable=maybe-no-member
+            if event.type == pygame.QUIT:
+                is_closed = True
+            # Line below is required to ignore pylint's fake-error from pygame module
+            # pylint: disable=maybe-no-member
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.__is_redraw_needed = True
+            # Line below is required to ignore pylint's fake-error from pygame module
+            # pylint: disable=maybe-no-member
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                col, row = self.__get_field_from_mouse_pos(pygame.mouse.get_pos())
+                if col >= 0 and row >= 0:
+                    clicked_fields.append((col, row))
+        return is_closed, clicked_fields
+
+    def draw(self, board: Board, current_color: PlayerColor, is_game_in_progress: bool) -> None:
+        '''
+        Draws the \"board\" with evaluation of possible moves, points of both players and player to move.
+        Only fields and texts changed since the previous call are redrawn. Moves are evaluated once per position.
+        '''
+        results = (f'{current_color.name.capitalize()}\'s turn' if is_game_in_progress else 'Game over', current_color.name,
+                   board.points[PlayerColor.WHITE], board.points[PlayerColor.BLACK])
+        position_hash = board.get_hash()
+        if not self.__is_redraw_needed and position_hash == self.__drawn_hash and results == self.__drawn_results:
+            return
+
+        dirty_rects = []
+        if self.__is_redraw_needed:
+            self.__window.fill(self.__BG_COLOR)
+            self.__draw_grid()
+            self.__drawn_fields = {}
+            self.__drawn_results = None
+            dirty_rects.append(self.__window.get_rect())
+        if position_hash != self.__drawn_hash or self.__is_redraw_needed:
+            for i in range(self.__cols):
+                for j in range(self.__rows):
+                    field = (board[i, j], board.evaluate_move(i, j, PlayerColor.BLACK), board.evaluate_move(i, j, PlayerColor.WHITE))
+                    if self.__drawn_fields.get((i, j)) != field:
+                        dirty_rects.append(self.__draw_field(i, j, *field))
+                        self.__drawn_fields[i, j] = field
+            self.__drawn_hash = position_hash
+        if results != self.__drawn_results:
+            dirty_rects.append(self.__draw_results(*results))
+            self.__drawn_results = results
+        self.__is_redraw_needed = False
+        pygame.display.update(dirty_rects)
+
+    def notify(self) -> None:
+        '''
+        Wakes up the thread waiting for events in \"process_events\" method. Can be called from any thread.
+        '''
+        pygame.event.post(pygame.event.Event(self.__NOTIFY_EVENT))
+
+    def __draw_field(self, col: int, row: int, value: int, black_evaluation: int, white_evaluation: int) -> pygame.Rect:
+        left = self.__WIDTH - self.__HEIGHT
+        field_x, field_y = left + col * self.__field_size, row * self.__field_size
+        rect = pygame.Rect(math.floor(field_x), math.floor(field_y), math.ceil(self.__field_size) + 2, math.ceil(self.__field_size) + 1)
+        # Lines of the grid are drawn clipped to the field, so neighbouring fields are not affected
+        self.__window.set_clip(rect)
+        self.__window.fill(self.__BG_COLOR)
+        self.__draw_grid()
+        if value != 0:
+            radius = math.ceil((self.__field_size - 10) / 2)
+            pygame.draw.circle(self.__window, PlayerColor(value).name, (field_x + radius + 5, field_y + radius + 5), radius)
+        if black_evaluation > -1:
+            self.__window.blit(self.__get_glyph(f'{black_evaluation}', 'black'), (field_x + 30, field_y + 15))
+        if white_evaluation > -1:
+            self.__window.blit(self.__get_glyph(f'{white_evaluation}', 'white'), (field_x + 30, field_y + 15))
+        self.__window.set_clip(None)
+        return rect
+
+    def __draw_grid(self) -> None:
+        left, right = self.__WIDTH - self.__HEIGHT, self.__WIDTH
+        top, bottom = 0, self.__HEIGHT
+        pygame.draw.line(self.__window, 'black', (left, top), (left, bottom), 4)
+        for i in range(self.__cols):
+            field_x = left + i * self.__field_size
+            pygame.draw.line(self.__window, 'black', (field_x, top), (field_x, bottom), 2)
+        for i in range(self.__rows):
+            field_y = top + i * self.__field_size
+            pygame.draw.line(self.__window, 'black', (left, field_y), (right, field_y))
+
+    def __draw_results(self, header: str, header_color: str, white_points: int, black_points: int) -> pygame.Rect:
+        # Panel ends before the thick line on the left edge of the board
+        rect = pygame.Rect(0, 0, self.__WIDTH - self.__HEIGHT - 2, self.__HEIGHT)
+        self.__window.fill(self.__BG_COLOR, rect)
+        self.__window.blits([
+            (self.__get_glyph(header, header_color), (10, self.__HEIGHT // 2 - 100)),
+            (self.__get_glyph(f'White: {white_points}', 'white'), (10, self.__HEIGHT // 2 - 45)),
+            (self.__get_glyph(f'Black: {black_points}', 'black'), (10, self.__HEIGHT // 2))
+        ])
+        return rect
+
+    def __get_glyph(self, text: str, color: str) -> pygame.Surface:
+        glyph = self.__glyphs.get((text, color))
+        if glyph is None:
+            glyph = self.__font.render(text, 1, color)
+            self.__glyphs[text, color] = glyph
+        return glyph
+
+    def __get_field_from_mouse_pos(self, mouse_pos: tuple[int, int]) -> tuple[int, int]:
+        mouse_x, mouse_y = mouse_pos
+        left = self.__WIDTH - self.__HEIGHT
+        col = int(round(mouse_x - left) // self.__field_size)
+        row = int(round(mouse_y) // self.__field_size)
+        return (col, row)
@@ -0,0 +1,47 @@
+from timeit import default_timer as timer
+from board import Board
+from othello_utils import PlayerColor
+from player import Player, UserPlayer
+
+class HeadlessGame:
+    '''
+    Class representing game between two bots without visualization.
+    Players are asked for their moves one after another in a single loop, without frame limiting and background threads.
+    '''
+    def __init__(self, players: list[Player]) -> None:
+        if any(isinstance(player, UserPlayer) for player in players):
+            raise Exception('Headless game can be played only by bots')
+        self.__players = {player.color.value: player for player in players}
+        self.__board = Board()
+        self.__move_times = {player.color: 0 for player in players}
+
+    def run_game(self) -> bool:
+        '''
+        Plays the whole game. Returns False, same as \"OthelloGame.run_game\" for game which was not interrupted.
+        '''
+        current_player = self.__players[PlayerColor.BLACK.value]
+        while self.__is_any_move_possible():
+            if not self.__board.can_move(current_player.color):
+                current_player = self.__players[-current_player.color.value]
+            time_start = timer()
+            col, row = current_player.get_next_move(self.__board.copy())
+            self.__move_times[current_player.color] += 1000 * (timer() - time_start)
+            if not self.__board.move(col, row, current_player.color):
+                raise Exception(f'Illegal move of {current_player}: COL: {col}, ROW: {row}')
+            current_player = self.__players[-current_player.color.value]
+        return False
+
+    def get_result(self) -> dict[PlayerColor, int]:
+        '''
+        Returns points scored by each player
+        '''
+        return self.__board.points
+
+    def get_times(self) -> dict[PlayerColor, int]:
+        '''
+        Returns accumulated move times for each player
+        '''
+        return self.__move_times
+
+    def __is_any_move_possible(self) -> bool:
+        return any(self.__board.can_move(player.color) for player in self.__players.values())
@@ -1,33 +1,121 @@
 import math
+from collections import defaultdict
+from threading import Event
+from timeit import default_timer as timer
 import numpy as np
+from alpha_beta import AlphaBetaSearch
 from board import Board
-from node import AlphaBetaNode
-from othello_utils import HEURISTIC_WEIGHTS, PlayerColor
+from move_ordering import MoveOrdering
+from node import AlphaBetaNode, SearchTimeout
+from othello_utils import HEURISTIC_WEIGHTS, BoardType, PlayerColor, SearchType
 from player import Player
 from state import AlphaBetaState
+from transposition_table import TranspositionTable
 
 class SimpleHeuristicPlayer(Player):
     '''
     Player performing all moves naively - by gaining the most points in one move.
     '''
     def get_next_move(self, board_copy: Board) -> tuple[int, int]:
-        moves = []
-        for i in range(board_copy.COLS):
-            for j in range(board_copy.ROWS):
-                if board_copy.evaluate_move(i, j, self.color) > 0:
-                    moves.append((i,j))
+        self._start_move_clock(board_copy)
+        moves = self._prepare_board(board_copy).get_legal_actions(self.color)
         moves_values = [HEURISTIC_WEIGHTS[col][row] for col, row in moves]
+        self._stop_move_clock()
 
         return moves[np.argmax(moves_values)]
 
 class AlphaBetaHeuristicPlayer(SimpleHeuristicPlayer):
     '''
     Player using alpha-beta prunning to determine next move.
+    Transposition table is kept between moves, unless its size is set to 0.
+    Unless move ordering is disabled, iterative deepening is used with principal variation search and killer and history heuristics.
+    Iterative deepening is also used if time of moves is limited - the move found by the deepest search completed before the deadline is returned.
+    Search is run by recursive \"AlphaBetaSearch\" over a single board or by tree of \"AlphaBetaNode\" objects, depending on \"search_type\".
+    Pondering always uses \"AlphaBetaSearch\", which fills the transposition table with the same entries as the tree search.
     '''
-    def __init__(self, color: PlayerColor, simulation_depth: int = 5) -> None:
-        super().__init__(color)
+    def __init__(self, color: PlayerColor, simulation_depth: int = 5, board_type: BoardType = BoardType.LIST, transposition_table_size: int = 100000,
+                 move_time_ms: int = None, game_time_ms: int = None, move_ordering: bool = True, search_type: SearchType = SearchType.RECURSIVE) -> None:
+        super().__init__(color, board_type, move_time_ms, game_time_ms)
+        self.move_ordering = move_ordering
+        self.search_type = search_type
         self.__max_depth = simulation_depth
+        self.__transposition_table = TranspositionTable(transposition_table_size) if transposition_table_size > 0 else None
+        self.__nodes_per_depth = defaultdict(int)
+        self.__moves_count = 0
+        self.__nodes_count = 0
+        self.__cutoffs_count = 0
+        self.__search_time = 0
 
     def get_next_move(self, board_copy: Board) -> tuple[int, int]:
-        tree_root = AlphaBetaNode(AlphaBetaState(board_copy, self.color), self.color, self.__max_depth, -math.inf, math.inf)
-        return tree_root.best_action()
+        board_copy = self._prepare_board(board_copy)
+        deadline = self._start_move_clock(board_copy)
+        move_ordering = MoveOrdering() if self.move_ordering else None
+        first_depth = min(2, self.__max_depth) if move_ordering is not None or deadline is not None else self.__max_depth
+        nodes_count, cutoffs_count, search_time = self.__nodes_count, self.__cutoffs_count, self.__search_time
+
+        # The shallowest search is always completed, so there is a move to return. It is interrupted only if player is requested to stop.
+        try:
+            move = self.__search(board_copy, first_depth, None, move_ordering)
+            completed_depth = first_depth
+            for depth in range(first_depth + 1, self.__max_depth + 1):
+                try:
+                    move = self.__search(board_copy, depth, deadline, move_ordering)
+                except SearchTimeout:
+                    break
+                completed_depth = depth
+        finally:
+            self._stop_profiling()
+        self.__moves_count += 1
+        nodes_count, cutoffs_count, search_time = self.__nodes_count - nodes_count, self.__cutoffs_count - cutoffs_count, self.__search_time - search_time
+        self._stop_move_clock({'depth': completed_depth, 'nodes': nodes_count, 'cutoffs': cutoffs_count, 'nodes_per_second': nodes_count / search_time})
+        return move
+
+    def ponder(self, board_copy: Board, stop_event: Event) -> None:
+        # Results are shared with the next move only through the transposition table, so there is nothing to do without it.
+        # Position is searched one level deeper than own moves, so entries of positions after the opponent's reply are deep enough to be used.
+        if self.__transposition_table is None:
+            return
+        board_copy = self._prepare_board(board_copy)
+        move_ordering = MoveOrdering() if self.move_ordering else None
+        search = AlphaBetaSearch(self.color, self.__transposition_table, move_ordering, stop_event=stop_event)
+        try:
+            for depth in range(min(2, self.__max_depth), self.__max_depth + 2):
+                search.search(board_copy, PlayerColor(-self.color.value), depth)
+        except SearchTimeout:
+            pass
+
+    def get_search_report(self) -> str:
+        if self.__moves_count == 0:
+            return None
+        nodes = ', '.join(f'{depth}: {count}' for depth, count in sorted(self.__nodes_per_depth.items()))
+        return (f'{self}: {self.__nodes_count / self.__search_time:.0f} nodes/s with {self.search_type.value} search, '
+                f'nodes searched per depth in {self.__moves_count} moves - {nodes}')
+
+    def __search(self, board_copy: Board, depth: int, deadline: float, move_ordering: MoveOrdering) -> tuple[int, int]:
+        # Nodes of interrupted searches are counted only for speed of the search
+        time_start = timer()
+        if self.search_type == SearchType.RECURSIVE:
+            search = AlphaBetaSearch(self.color, self.__transposition_table, move_ordering, deadline, self._stop_event)
+            try:
+                _, principal_variation = search.search(board_copy, self.color, depth)
+            finally:
+                self.__update_statistics(search.nodes_count, search.cutoffs_count, timer() - time_start)
+            col, row, _ = principal_variation[0]
+            move = (col, row)
+            nodes_count = search.nodes_count
+        else:
+            tree_root = AlphaBetaNode(AlphaBetaState(board_copy, self.color), self.color, depth, -math.inf, math.inf,
+                                      transposition_table = self.__transposition_table, deadline = deadline, move_ordering = move_ordering,
+                                      stop_event = self._stop_event)
+            try:
+                move = tree_root.best_action()
+            finally:
+                self.__update_statistics(tree_root.nodes_count, tree_root.cutoffs_count, timer() - time_start)
+            nodes_count = tree_root.nodes_count
+        self.__nodes_per_depth[depth] += nodes_count
+        return move
+
+    def __update_statistics(self, nodes_count: int, cutoffs_count: int, search_time: float) -> None:
+        self.__nodes_count += nodes_count
+        self.__cutoffs_count += cutoffs_count
+        self.__search_time += search_time
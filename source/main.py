@@ -1,34 +1,39 @@
-from timeit import default_timer as timer
+import json
 from config import ConfigModel
-from othello_game import OthelloGame
+from tournament import play_matches
 
 def main():
     '''
     Project's entry point.
-    Reads config from file, parses it and run all games one by one, using configured UI and printing results to console.
+    Reads config from file, parses it and run all games, using configured UI and printing results to console.
+    Games between bots without visualization are played by headless runner, matches can be played concurrently by multiple worker processes.
+    Results and statistics of all moves of bots (written as JSON lines, if telemetry is enabled) are saved after each game, or after each match played by worker processes.
     '''
     config = ConfigModel.get_from_file('source/config/config.json')
+    telemetry_file_name = config.get_telemetry_file()
 
     if config.output_file:
         with open(config.output_file, 'w', encoding='utf8') as output_file:
             output_file.write('player1,color1,result1,player2,color2,result2\n')
+    if telemetry_file_name:
+        with open(telemetry_file_name, 'w', encoding='utf8'):
+            pass
 
     matches = config.get_matches()
-    for i, match in enumerate(matches):
+    for i, (match, games) in enumerate(play_matches(matches, config.show_visualization, config.tournament_workers, config.ponder,
+                                                    config.profile_move, config.get_profile_prefix(), telemetry_file_name is not None)):
         player_names = match.player_names
         print(f'\nMatch {i + 1}: {player_names[0]} vs {player_names[1]}')
-        for j, players in enumerate(match.get_games()):
-            game = OthelloGame(players, config.show_visualization)
-            time_start = timer()
-            if not game.run_game():
-                result = game.get_result()
-                times = game.get_times()
-                match.add_game_result(j, result)
-                print(f'Game result ({players[0].color.name} - {players[1].color.name}): {match.results[-1][0]} - {match.results[-1][1]}')
-                print(f'Game time: {1000 * (timer() - time_start)} ({times[players[0].color]} s vs {times[players[1].color]})')
-                if config.output_file:
-                    with open(config.output_file, 'a', encoding='utf8') as output_file:
-                        output_file.write(f'{player_names[0]},{players[0].color.name.lower()},{match.results[-1][0]},{player_names[1]},{players[1].color.name.lower()},{match.results[-1][1]}\n')
+        # Results are written after each game, so they are kept even if later games are interrupted
+        for report, rows, move_statistics in games:
+            for line in report:
+                print(line)
+            if config.output_file:
+                with open(config.output_file, 'a', encoding='utf8') as output_file:
+                    output_file.writelines(rows)
+            if telemetry_file_name:
+                with open(telemetry_file_name, 'a', encoding='utf8') as telemetry_file:
+                    telemetry_file.writelines(json.dumps({'match': i + 1, **statistics}) + '\n' for statistics in move_statistics)
         print(f'Match result: {match.total[0]} - {match.total[1]}')
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 from typing import Generator
 from othello_utils import PlayerColor
-from player import Player
+from player import Player, UserPlayer
 
 class Match():
     '''
@@ -23,6 +23,12 @@ class Match():
             if self.total[0] < 2 and self.total[1] < 2:
                 yield [game[0], game[1]]
 
+    def has_user_player(self) -> bool:
+        '''
+        Returns True if any game of the match is played by player controlled by the user.
+        '''
+        return any(isinstance(player, UserPlayer) for game in self.__games for player in game)
+
     def add_game_result(self, game_number: int, result: dict[PlayerColor, int]) -> None:
         '''
         Updates match with \"result\" of game with specified \"game_number\".
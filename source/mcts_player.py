@@ -1,5 +1,9 @@
+from concurrent.futures import ProcessPoolExecutor
+from threading import Event
+from timeit import default_timer as timer
+from array_tree import ArrayTree
 from board import Board
-from othello_utils import PlayerColor, MCTSVersion
+from othello_utils import BoardType, PlayerColor, MCTSVersion, ParallelMode, TreeStorage
 from state import State, GroupingGraphState
 from node import MCTSNode, GroupingGraphNode
 from player import Player
@@ -7,34 +11,205 @@ from player import Player
 class MCTSPlayer(Player):
     '''
     Class representing a player using one of the implemented verions of MCTS algorithm.
+    If more than one worker is configured, independent searches with different seeds are run in separate processes (root parallelization)
+    or rollouts of a single shared tree are run concurrently in separate processes (tree parallelization).
+    Unless disabled, subtree of the position reached after player's move and opponent's reply is kept from previous search, so only missing simulations are run.
+    Kept subtree is also searched further while pondering on the opponent's time, always by a single worker.
+    If time of moves is limited, search stops at the deadline even if not all simulations were run.
+    Tree can be stored in numpy arrays instead of node objects, except for grouped states and tree parallelization, which always use objects.
     '''
-    def __init__(self, color: PlayerColor, seed: int = 10, simulation_count: int = 500, version: MCTSVersion = MCTSVersion.UCT) -> None:
-        super().__init__(color)
+    __CALIBRATION_SIMULATION_COUNT = 20
+    __PONDER_SIMULATION_FACTOR = 4
+
+    def __init__(self, color: PlayerColor, seed: int = 10, simulation_count: int = 500, version: MCTSVersion = MCTSVersion.UCT, board_type: BoardType = BoardType.LIST,
+                 rollouts_per_leaf: int = 1, workers: int = 1, parallel_mode: ParallelMode = ParallelMode.ROOT, reuse_tree: bool = True,
+                 move_time_ms: int = None, game_time_ms: int = None, tree_storage: TreeStorage = TreeStorage.OBJECTS) -> None:
+        super().__init__(color, board_type, move_time_ms, game_time_ms)
         self.simulation_count = simulation_count
+        self.rollouts_per_leaf = rollouts_per_leaf
         self.version = version
         self.seed = seed
+        self.workers = workers
+        self.parallel_mode = parallel_mode
+        self.reuse_tree = reuse_tree
+        self.tree_storage = tree_storage
         self.state_dict = {}
+        self.__executor = None
+        self.__tree_root = None
+        self.__last_action = None
+        self.__baseline_iterations_per_second = None
+        self.__parallel_iterations = 0
+        self.__parallel_time = 0
+        self.__speedups = []
 
     def get_next_move(self, board_copy: Board) -> tuple[int, int]:
-        version_tmp = self.version
-        if version_tmp == MCTSVersion.UCT_GROUPING:
-            if board_copy.points[PlayerColor.BLACK] + board_copy.points[PlayerColor.WHITE] < 15:
-                state = GroupingGraphState(board_copy, self.color)
-                state_to_str = state.to_string()
-                self.state_dict[state_to_str] = state
-
-                tree_root = GroupingGraphNode(GroupingGraphState(board_copy, self.color), self.color, state_dict = self.state_dict, seed = self.seed)
-                best_action = tree_root.best_action(int(self.simulation_count/2))
-                col, row, _  = best_action.parent_action
+        board_copy = self._prepare_board(board_copy)
+        if self.workers > 1 and self.parallel_mode == ParallelMode.TREE:
+            # Baseline is measured before the move clock starts, so it does not use time of the move
+            self.__baseline_iterations_per_second = self.__measure_baseline(board_copy)
+        deadline = self._start_move_clock(board_copy)
+        time_start = timer()
+        try:
+            if self.workers > 1 and self.parallel_mode == ParallelMode.TREE:
+                move, statistics = self.__get_tree_parallel_move(board_copy, deadline)
+            elif self.workers > 1:
+                move, statistics = self.__get_root_parallel_move(board_copy, deadline)
             else:
-                version_tmp = MCTSVersion.UCT
+                tree_root, simulation_count = self.__get_tree(board_copy)
+                best_action = tree_root.best_action(simulation_count, deadline, self._stop_event)
+                action = best_action if isinstance(tree_root, ArrayTree) else best_action.parent_action
+                statistics = self.__get_tree_statistics(tree_root)
+                self.__store_tree(tree_root, action)
+                col, row, _  = action
+                move = (col, row)
+        finally:
+            self._stop_profiling()
+        statistics['rollouts_per_second'] = statistics['rollouts'] / (timer() - time_start)
+        self._stop_move_clock(statistics)
+        return move
+
+    def ponder(self, board_copy: Board, stop_event: Event) -> None:
+        # Tree kept after own move is searched further from position after the move, so it can be reused after the opponent's reply.
+        # Search continues until the opponent moves or until subtree of each reply has enough iterations for the whole next move.
+        # Replies that are bad for the opponent are rarely visited, so the search is also limited to a few times more iterations than needed for all replies
+        if self.__tree_root is None:
+            return
+        board_copy = self._prepare_board(board_copy)
+        opponent_color = PlayerColor(-self.color.value)
+        tree_root = self.__tree_root.get_subtree(self.__last_action, board_copy, opponent_color)
+        self.__tree_root = None
+        if tree_root is None:
+            return
+        # Opponent without moves passes, so root's children are player's own moves
+        replies_count = len(board_copy.get_legal_actions(opponent_color)) or len(board_copy.get_legal_actions(self.color))
+        max_iterations = self.__PONDER_SIMULATION_FACTOR * self.simulation_count * replies_count
+        while not stop_event.is_set() and tree_root.n() / self.rollouts_per_leaf < max_iterations:
+            children_statistics = tree_root.get_children_statistics()
+            if len(children_statistics) == replies_count and all(visits / self.rollouts_per_leaf >= self.simulation_count for _, visits, _ in children_statistics):
+                break
+            tree_root.best_action(self.simulation_count, stop_event=stop_event)
+        self.__tree_root, self.__last_action = tree_root, None
+
+    def get_search_report(self) -> str:
+        # Speed of single worker differs between positions, so it is compared with speed of parallel search of the same position and averaged over moves
+        if self.__parallel_iterations == 0:
+            return None
+        iterations_per_second = self.__parallel_iterations / self.__parallel_time
+        speedup = sum(self.__speedups) / len(self.__speedups)
+        return (f'{self}: {iterations_per_second:.1f} iterations/s with {self.workers} workers in tree parallelization, '
+                f'{speedup:.2f}x single worker on average over {len(self.__speedups)} moves')
+
+    def close(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def _create_tree(self, board_copy: Board, seed: int, state_dict: dict) -> tuple[MCTSNode | ArrayTree, int]:
+        '''
+        Returns root of the tree for position on \"board_copy\" and number of simulations that should be run for it.
+        '''
+        if self.__is_grouping_used(board_copy):
+            state = GroupingGraphState(board_copy, self.color)
+            state_dict[state.get_key()] = state
+
+            tree_root = GroupingGraphNode(State(board_copy, self.color), self.color, state_dict = state_dict, seed = seed, grouped_state = state,
+                                          rollouts_per_leaf = self.rollouts_per_leaf)
+            return tree_root, self.__get_simulation_count(board_copy)
+
+        version = MCTSVersion.UCT if self.version == MCTSVersion.UCT_GROUPING else self.version
+        if self.tree_storage == TreeStorage.ARRAYS and not (self.workers > 1 and self.parallel_mode == ParallelMode.TREE):
+            return ArrayTree(board_copy, self.color, self.color, seed, version, self.rollouts_per_leaf), self.__get_simulation_count(board_copy)
+        tree_root = MCTSNode(State(board_copy, self.color), self.color, seed, version = version, rollouts_per_leaf = self.rollouts_per_leaf)
+        return tree_root, self.__get_simulation_count(board_copy)
+
+    def __is_grouping_used(self, board_copy: Board) -> bool:
+        return self.version == MCTSVersion.UCT_GROUPING and board_copy.points[PlayerColor.BLACK] + board_copy.points[PlayerColor.WHITE] < 15
+
+    def __get_simulation_count(self, board_copy: Board) -> int:
+        return int(self.simulation_count/2) if self.__is_grouping_used(board_copy) else self.simulation_count
+
+    def __get_tree(self, board_copy: Board) -> tuple[MCTSNode | ArrayTree, int]:
+        # Subtree of previous search is reused only if the same kind of tree would be created for current position
+        if self.__tree_root is not None and isinstance(self.__tree_root, GroupingGraphNode) == self.__is_grouping_used(board_copy):
+            tree_root = self.__tree_root.get_subtree(self.__last_action, board_copy)
+            self.__tree_root = None
+            if tree_root is not None:
+                reused_iterations = int(tree_root.n() / self.rollouts_per_leaf)
+                return tree_root, max(self.__get_simulation_count(board_copy) - reused_iterations, 1)
+        return self._create_tree(board_copy, self.seed, self.state_dict)
 
-        if version_tmp != MCTSVersion.UCT_GROUPING:
-            tree_root = MCTSNode(State(board_copy, self.color), self.color, self.seed, version = version_tmp)
-            best_action = tree_root.best_action(self.simulation_count)
-            col, row, _  = best_action.parent_action
+    def __store_tree(self, tree_root: MCTSNode | ArrayTree, action: tuple[int, int, PlayerColor]) -> None:
+        if self.reuse_tree:
+            self.__tree_root = tree_root
+            self.__last_action = action
 
-        return (col, row)
+    def __get_tree_statistics(self, tree_root: MCTSNode | ArrayTree) -> dict:
+        iterations = tree_root.get_iteration_count()
+        statistics = {'iterations': iterations, 'rollouts': iterations * self.rollouts_per_leaf}
+        # Size of the tree is known only after walking all its nodes, so it is measured only for telemetry
+        if self._is_telemetry_enabled:
+            statistics['tree_nodes'], statistics['max_depth'] = tree_root.get_tree_size()
+        return statistics
+
+    def __get_tree_parallel_move(self, board_copy: Board, deadline: float) -> tuple[tuple[int, int], dict]:
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(self.workers)
+        tree_root, simulation_count = self.__get_tree(board_copy)
+        time_start = timer()
+        best_action = tree_root.best_action_parallel(simulation_count, self.__executor, self.workers, deadline, self._stop_event)
+        parallel_time = timer() - time_start
+        self.__parallel_time += parallel_time
+        self.__parallel_iterations += tree_root.get_iteration_count()
+        self.__speedups.append(tree_root.get_iteration_count() / parallel_time / self.__baseline_iterations_per_second)
+        statistics = self.__get_tree_statistics(tree_root)
+        self.__store_tree(tree_root, best_action.parent_action)
+        col, row, _  = best_action.parent_action
+        return (col, row), statistics
+
+    def __measure_baseline(self, board_copy: Board) -> float:
+        # Short single-worker search of a new tree, used as baseline for reporting efficiency of parallelization in the same position
+        tree_root, _ = self._create_tree(board_copy.copy(), self.seed, {})
+        time_start = timer()
+        tree_root.best_action(self.__CALIBRATION_SIMULATION_COUNT)
+        return self.__CALIBRATION_SIMULATION_COUNT / (timer() - time_start)
+
+    def __get_root_parallel_move(self, board_copy: Board, deadline: float) -> tuple[tuple[int, int], dict]:
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(self.workers)
+        # Timer values are not comparable between processes, so workers get remaining time instead of the deadline
+        time_limit = None if deadline is None else deadline - timer()
+        futures = [self.__executor.submit(search_root, self, board_copy, self.seed + i, time_limit) for i in range(self.workers)]
+
+        statistics = {}
+        iterations = 0
+        for future in futures:
+            children_statistics, iteration_count = future.result()
+            iterations += iteration_count
+            for action, visits, value in children_statistics:
+                total_visits, total_value = statistics.get(action, (0, 0))
+                statistics[action] = (total_visits + visits, total_value + value)
+
+        col, row, _ = max(statistics, key=lambda action: statistics[action][1] / statistics[action][0])
+        # Trees of workers are not sent back, so their size is not known
+        return (col, row), {'iterations': iterations, 'rollouts': iterations * self.rollouts_per_leaf}
+
+    def __getstate__(self) -> dict:
+        # Executor cannot be sent to worker processes, they also use their own dictionaries of grouped states
+        state = super().__getstate__()
+        state['_MCTSPlayer__executor'] = None
+        state['_MCTSPlayer__tree_root'] = None
+        state['state_dict'] = {}
+        return state
 
     def __str__(self) -> str:
         return f'{type(self).__name__}-{self.version.name} ({self.color.name.lower()})'
+
+def search_root(player: MCTSPlayer, board_copy: Board, seed: int, time_limit: float = None) -> tuple[list[tuple[tuple[int, int, PlayerColor], float, float]], int]:
+    '''
+    Runs a single search of \"player\" with specified \"seed\" and returns statistics of root's children and number of iterations run. Used by worker processes in root parallelization.
+    If \"time_limit\" (in seconds) is given, search stops when it runs out.
+    '''
+    deadline = None if time_limit is None else timer() + time_limit
+    tree_root, simulation_count = player._create_tree(board_copy, seed, player.state_dict)
+    tree_root.best_action(simulation_count, deadline)
+    return tree_root.get_children_statistics(), tree_root.get_iteration_count()
@@ -0,0 +1,35 @@
+from collections import defaultdict
+from othello_utils import HEURISTIC_WEIGHTS, PlayerColor
+
+# Fields with the highest heuristic weight, which can never be captured once taken
+CORNERS = {(col, row) for col, weights in enumerate(HEURISTIC_WEIGHTS) for row, weight in enumerate(weights) if weight == max(map(max, HEURISTIC_WEIGHTS))}
+
+class MoveOrdering:
+    '''
+    Orders moves searched by alpha-beta prunning, so that moves most likely to cause a cutoff are searched first.
+    Best move stored for the position is searched first, followed by corners, killer moves of the same level and moves with the highest history score.
+    Killer moves and history scores are collected from moves which caused cutoffs.
+    '''
+    KILLERS_PER_LEVEL = 2
+
+    def __init__(self) -> None:
+        self.__killers = defaultdict(list)
+        self.__history = defaultdict(int)
+
+    def order(self, actions: list[tuple[int, int, PlayerColor]], level: int, best_move: tuple[int, int, PlayerColor] = None) -> list[tuple[int, int, PlayerColor]]:
+        '''
+        Returns \"actions\" available on specified \"level\" of the tree, sorted from the most promising one.
+        '''
+        killers = self.__killers[level]
+        return sorted(actions, key=lambda action: (action != best_move, (action[0], action[1]) not in CORNERS, action not in killers,
+                                                   -self.__history[action], -HEURISTIC_WEIGHTS[action[0]][action[1]]))
+
+    def add_cutoff(self, action: tuple[int, int, PlayerColor], level: int, depth: int) -> None:
+        '''
+        Records that \"action\" caused a cutoff on specified \"level\" of the tree, searched to remaining \"depth\".
+        '''
+        killers = self.__killers[level]
+        if action not in killers:
+            killers.insert(0, action)
+            del killers[self.KILLERS_PER_LEVEL:]
+        self.__history[action] += depth * depth
@@ -1,10 +1,16 @@
 from abc import abstractmethod
 from collections import defaultdict
-import copy
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
 from random import Random
+from threading import Event
+from timeit import default_timer as timer
 import numpy as np
+from batch_rollout import get_rollout_results
+from board import Board
 from othello_utils import PlayerColor, MCTSVersion
 from state import AlphaBetaState, State, GroupingGraphState
+from move_ordering import MoveOrdering
+from transposition_table import Bound, TranspositionTable
 
 class Node:
     '''
@@ -39,11 +45,15 @@ class MCTSNode(Node):
     '''
     Class representing a node in a tree for base version of MCTS algorithm. Base class for nodes used by modified algorithms.
     '''
-    def __init__(self, state: State, color: PlayerColor, seed: int, parent: "MCTSNode" = None, parent_action: tuple[int, int, PlayerColor] = None, version: MCTSVersion = MCTSVersion.UCT):
+    # Indicates if nodes keep statistics of their children in arrays, used for scoring all children at once
+    _has_children_arrays = True
+
+    def __init__(self, state: State, color: PlayerColor, seed: int, parent: "MCTSNode" = None, parent_action: tuple[int, int, PlayerColor] = None, version: MCTSVersion = MCTSVersion.UCT,
+                 rollouts_per_leaf: int = 1):
         super().__init__(state, color, parent, parent_action)
         self.parent = parent
         self.version = version
-        self.reward_list = []
+        self.rollouts_per_leaf = rollouts_per_leaf
         self._children = []
         self._number_of_visits = 0
         self._results = defaultdict(int)
@@ -52,22 +62,106 @@ class MCTSNode(Node):
         self._results[-1] = 0
         self._untried_actions = None
         self._untried_actions = self._get_untried_actions()
+        # Statistics of children are also kept in arrays, so all children are scored at once during selection.
+        # Sum of squared rewards of rollouts (without virtual loss) is used by UCB1-tuned, mean reward is given by numbers of results.
+        self._index = len(parent._children) if parent is not None else None
+        self._children_visits = np.zeros(len(self._untried_actions)) if self._has_children_arrays else None
+        self._children_values = np.zeros(len(self._untried_actions)) if self._has_children_arrays else None
+        self._children_squared_rewards = np.zeros(len(self._untried_actions)) if self._has_children_arrays else None
         self._random_seed = seed
         self._random = Random(self._random_seed)
         self._iteration_count = None
 
-    def best_action(self, simulation_count: int) -> tuple[int, int]:
+    def best_action(self, simulation_count: int, deadline: float = None, stop_event: Event = None) -> tuple[int, int]:
         '''
         Returns best action for node.
+        All nodes of the tree share the board of this node, which is restored after each iteration.
+        If more than one rollout per leaf is configured, all rollouts from the leaf are played at once by the batched rollout engine.
+        If "deadline" (value of timer) is given, search stops when it passes, even if not all simulations were run. Search also stops when \"stop_event\" is set.
+        At least one simulation is always run.
         '''
         for i in range(simulation_count):
+            if i > 0 and ((deadline is not None and timer() >= deadline) or (stop_event is not None and stop_event.is_set())):
+                break
             self._iteration_count = i + 1
             vertex = self._tree_policy()
-            reward = vertex._rollout()
-            vertex._backpropagate(reward)
+            if self.rollouts_per_leaf > 1:
+                vertex._backpropagate_results(vertex._batch_rollout())
+            else:
+                vertex._backpropagate_results({vertex._rollout(): 1})
+            vertex._undo_path(self)
+
+        return self._best_child_simple()
+
+    def best_action_parallel(self, simulation_count: int, executor: Executor, workers: int, deadline: float = None, stop_event: Event = None) -> "MCTSNode":
+        '''
+        Returns best action for node, searching single tree with up to \"workers\" rollouts running concurrently in \"executor\".
+        Nodes on the path to each pending rollout get a virtual loss, so following selections spread across different leaves.
+        If \"deadline\" (value of timer) is given, no rollouts are started after it passes and only pending ones are completed. The same applies when \"stop_event\" is set.
+        '''
+        pending = {}
+        started_count = 0
+        completed_count = 0
+
+        def can_start() -> bool:
+            if started_count == 0:
+                return simulation_count > 0
+            return started_count < simulation_count and (deadline is None or timer() < deadline) and (stop_event is None or not stop_event.is_set())
+
+        while pending or can_start():
+            while len(pending) < workers and can_start():
+                vertex = self._tree_policy()
+                vertex._update_path_statistics(self, -1, 1)
+                future = executor.submit(simulate, vertex.state.board.copy(), vertex.state.current_color, self.player_color,
+                                         self._random.getrandbits(32), self.rollouts_per_leaf)
+                pending[future] = vertex
+                vertex._undo_path(self)
+                started_count += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                vertex = pending.pop(future)
+                vertex._update_path_statistics(self, -1, -1)
+                vertex._backpropagate_results(future.result())
+                completed_count += 1
+                self._iteration_count = completed_count
 
         return self._best_child_simple()
 
+    def get_children_statistics(self) -> list[tuple[tuple[int, int, PlayerColor], float, float]]:
+        '''
+        Returns action, number of visits and value of each child of the node.
+        '''
+        return [(child.parent_action, child.n(), child.valuate()) for child in self._children]
+
+    def get_subtree(self, action: tuple[int, int, PlayerColor], board: Board, color: PlayerColor = None) -> "MCTSNode":
+        '''
+        Returns node reached from this node by \"action\" and opponent's reply (or pass), whose position is the same as on \"board\" and whose player is to move.
+        If \"action\" is None, node is searched among this node and its children. If \"color\" is given, node with player of that color to move is searched instead.
+        Returned node is detached from its parent, so it becomes root of a separate tree and its siblings can be released.
+        The shared board of the tree is left in position of returned node. Returns None if no such node was expanded.
+        '''
+        color = self.player_color if color is None else color
+        tree_board = self.state.board
+        if action is None:
+            child = self
+        else:
+            child = next((c for c in self._children if c.parent_action == action), None)
+            if child is None:
+                return None
+            tree_board.make_move(*action)
+        field = board.get_field()
+        if tree_board.get_field() == field and child.state.current_color == color:
+            child.parent = None
+            return child
+        for grandchild in child._children:
+            tree_board.make_move(*grandchild.parent_action)
+            if tree_board.get_field() == field and grandchild.state.current_color == color:
+                grandchild.parent = None
+                return grandchild
+            tree_board.undo_move()
+        return None
+
     def get_iteration_count(self) -> int:
         '''
         Returns number of MCTS iterations performed so far.
@@ -75,7 +169,29 @@ class MCTSNode(Node):
         if self.parent is None:
             return self._iteration_count
         else:
-            return self.get_iteration_count()
+            return self.parent.get_iteration_count()
+
+    def get_tree_size(self) -> tuple[int, int]:
+        '''
+        Returns number of nodes in the tree below this node (including this node) and depth of the deepest of them.
+        Nodes shared by multiple parents are counted once, at depth of the shortest path.
+        '''
+        visited = {id(self)}
+        level = [self]
+        depth = 0
+        nodes_count = 1
+        while True:
+            next_level = []
+            for node in level:
+                for child in node._children:
+                    if id(child) not in visited:
+                        visited.add(id(child))
+                        next_level.append(child)
+            if not next_level:
+                return nodes_count, depth
+            nodes_count += len(next_level)
+            depth += 1
+            level = next_level
 
     def _get_untried_actions(self) -> list[tuple[int, int, PlayerColor]]:
         '''
@@ -104,11 +220,13 @@ class MCTSNode(Node):
 
     def _expand(self) -> "MCTSNode":
         '''
-        Expands the tree towards a random unexplored child
+        Expands the tree towards a random unexplored child.
+        Move is made in place on the shared board, so the board is left in child's position.
         '''
         col, row, move_color = self._untried_actions.pop()
-        board, color= self.state.move(col, row)
-        child_node = MCTSNode(State(board, color), self.player_color, self._random_seed, parent=self, parent_action=(col, row, move_color), version=self.version)
+        self.state.board.make_move(col, row, move_color)
+        child_node = MCTSNode(State(self.state.board, PlayerColor(-move_color.value)), self.player_color, self._random_seed, parent=self, parent_action=(col, row, move_color), version=self.version,
+                              rollouts_per_leaf=self.rollouts_per_leaf)
 
         self._children.append(child_node)
         return child_node
@@ -122,8 +240,10 @@ class MCTSNode(Node):
     def _rollout(self)-> int:
         '''
         Simulate the game from node
+        Moves are made in place on the shared board and reverted before returning the result.
         '''
-        current_rollout_state = copy.deepcopy(self.state)
+        current_rollout_state = State(self.state.board, self.state.current_color)
+        moves_count = 0
 
         while not current_rollout_state.is_game_over():
             if not current_rollout_state.can_move():
@@ -131,22 +251,70 @@ class MCTSNode(Node):
 
             possible_moves = current_rollout_state.get_legal_actions()
             col, row, _ = self._rollout_policy(possible_moves)
-            board, color = current_rollout_state.move(col, row)
-            current_rollout_state = State(board, color)
+            current_rollout_state.make_move(col, row)
+            moves_count += 1
 
-        return current_rollout_state.game_result(self.player_color)
+        result = current_rollout_state.game_result(self.player_color)
+        for _ in range(moves_count):
+            current_rollout_state.undo_move()
+        return result
 
-    def _backpropagate(self, result: int) -> None:
+    def _batch_rollout(self) -> dict[int, int]:
+        '''
+        Simulates \"rollouts_per_leaf\" random games from node at once and returns number of each result
         '''
-        Backpropagates through visited nodes and updates statistics
+        rng = np.random.default_rng(self._random.getrandbits(32))
+        return get_rollout_results(self.state.board, self.state.current_color, self.player_color, self.rollouts_per_leaf, rng)
+
+    def _backpropagate_results(self, results: dict[int, int]) -> None:
         '''
-        if self.state.current_color != self.player_color:
-            result = -result
-        self._number_of_visits += 1.
-        self._results[result] += 1.
-        self.reward_list.append(result)
+        Backpropagates number of each result of one or more rollouts through visited nodes and updates statistics.
+        Nodes are updated in a single loop from this node to the root, instead of recursive calls for each level.
+        '''
+        wins, draws, losses = results.get(1, 0), results.get(0, 0), results.get(-1, 0)
+        node = self
+        while node is not None:
+            if node.state.current_color != node.player_color:
+                wins, losses = losses, wins
+            node._number_of_visits += wins + draws + losses
+            node._results[1] += wins
+            node._results[0] += draws
+            node._results[-1] += losses
+            parent = node.parent
+            if parent is not None:
+                parent._children_visits[node._index] += wins + draws + losses
+                parent._children_values[node._index] += wins - losses
+                parent._children_squared_rewards[node._index] += wins + losses
+            node = parent
+
+    def _update_statistics(self, result: int, count: float) -> None:
+        '''
+        Adds \"count\" visits with specified \"result\" to statistics of the node. Negative count removes them.
+        '''
+        self._number_of_visits += count
+        self._results[result] += count
         if self.parent:
-            self.parent._backpropagate(result)
+            # Virtual loss is not a reward of rollout, so it is not added to sum of squared rewards
+            self.parent._children_visits[self._index] += count
+            self.parent._children_values[self._index] += result * count
+
+    def _get_children_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+        Returns arrays with number of visits, values and sums of squared rewards of expanded children, in order of expansion.
+        '''
+        children_count = len(self._children)
+        return self._children_visits[:children_count], self._children_values[:children_count], self._children_squared_rewards[:children_count]
+
+    def _update_path_statistics(self, root: "MCTSNode", result: int, count: float) -> None:
+        '''
+        Adds \"count\" visits with specified \"result\" to statistics of all nodes on the path from \"root\" to this node.
+        Used for applying and reverting virtual loss.
+        '''
+        current_node = self
+        current_node._update_statistics(result, count)
+        while current_node is not root:
+            current_node = current_node.parent
+            current_node._update_statistics(result, count)
 
     def _is_fully_expanded(self) -> bool:
         '''
@@ -159,12 +327,13 @@ class MCTSNode(Node):
         '''
         Returns the most promising child using the formula specified by version
         '''
+        visits, values, squared_rewards = self._get_children_arrays()
+        log_visits = np.log(self.n())
         if self.version == MCTSVersion.UCT or self.version == MCTSVersion.UCT_GROUPING:
-            choices_weights = [(c.valuate() / c.n()) + c_param * np.sqrt((np.log(self.n()) / c.n())) for c in self._children]
+            choices_weights = values / visits + c_param * np.sqrt(log_visits / visits)
         if self.version == MCTSVersion.UCB1_TUNED:
-            vertex = [np.sum([x**2 for x in c.reward_list])/c.n() - (c.valuate()/c.n())**2 + np.sqrt(2*np.log(self.n()) / c.n()) for c in self._children]
-            c_params = [np.sqrt(np.min([1/4, v_i])) for v_i in vertex]
-            choices_weights = [(c.valuate() / c.n()) + c_params[i] * np.sqrt((np.log(self.n()) / c.n()))  for i, c in enumerate(self._children, start=0)]
+            vertex = squared_rewards / visits - (values / visits)**2 + np.sqrt(2 * log_visits / visits)
+            choices_weights = values / visits + np.sqrt(np.minimum(1/4, vertex)) * np.sqrt(log_visits / visits)
 
         return self._children[np.argmax(choices_weights)]
 
@@ -172,8 +341,8 @@ class MCTSNode(Node):
         '''
         Returns the best child using simple formula
         '''
-        choices_weights = [(c.valuate() / c.n())  for c in self._children]
-        return self._children[np.argmax(choices_weights)]
+        visits, values, _ = self._get_children_arrays()
+        return self._children[np.argmax(values / visits)]
 
     def _rollout_policy(self, possible_moves: list[tuple[int, int, PlayerColor]]) -> tuple[int, int, PlayerColor]:
         '''
@@ -192,16 +361,44 @@ class MCTSNode(Node):
                 return current_node._expand()
             else:
                 current_node = current_node._best_child(c_param= np.sqrt(2))
+                col, row, move_color = current_node.parent_action
+                current_node.state.board.make_move(col, row, move_color)
         return current_node
 
+    def _undo_path(self, root: "MCTSNode") -> None:
+        '''
+        Reverts moves made on the shared board on the path from \"root\" to this node.
+        '''
+        current_node = self
+        while current_node is not root:
+            current_node.state.board.undo_move()
+            current_node = current_node.parent
+
+class SearchTimeout(Exception):
+    '''
+    Raised when search is interrupted, because its deadline passed or it was requested to stop.
+    '''
+
 class AlphaBetaNode(Node):
     '''
     Class representing a node in a tree for alpha-beta prunning algorithm.
+    If transposition table is provided, results of positions already searched to sufficient depth are reused and their best moves are searched first.
+    If deadline (value of timer) is provided, search raises \"SearchTimeout\" when it passes. The same applies when stop event is set.
+    If move ordering is provided, moves are searched in its order and all moves except the first one are searched with null window first (principal variation search).
+    Number of nodes searched and cutoffs made in the whole tree are counted by the root.
     '''
-    def __init__(self, state: AlphaBetaState, player_color: PlayerColor, max_depth: int, alpha: int, beta: int, parent: Node = None, parent_action: tuple[int, int, PlayerColor] = None):
+    def __init__(self, state: AlphaBetaState, player_color: PlayerColor, max_depth: int, alpha: int, beta: int, parent: Node = None, parent_action: tuple[int, int, PlayerColor] = None,
+                 transposition_table: TranspositionTable = None, deadline: float = None, move_ordering: MoveOrdering = None, stop_event: Event = None):
         super().__init__(state, player_color, parent, parent_action)
         self.level = parent.level + 1 if isinstance(parent, AlphaBetaNode) else 0
+        self.root = parent.root if isinstance(parent, AlphaBetaNode) else self
+        self.nodes_count = 0
+        self.cutoffs_count = 0
         self.best_child = None
+        self.transposition_table = transposition_table
+        self.deadline = deadline
+        self.stop_event = stop_event
+        self.move_ordering = move_ordering
         self.__max_depth = max_depth
         self.__alpha = alpha
         self.__beta = beta
@@ -211,85 +408,210 @@ class AlphaBetaNode(Node):
         return (self.best_child.parent_action[0], self.best_child.parent_action[1])
 
     def valuate(self) -> int:
+        if (self.deadline is not None and timer() >= self.deadline) or (self.stop_event is not None and self.stop_event.is_set()):
+            raise SearchTimeout()
+        self.root.nodes_count += 1
         if self.is_terminal_node():
             return self.state.game_result(self.state.current_color)
 
+        board = self.state.board
+        depth = self.__max_depth - self.level
+        key = None
+        tt_move = None
+        if self.transposition_table is not None:
+            key = TranspositionTable.get_key(board.get_hash(), self.state.current_color)
+            entry = self.transposition_table.lookup(key)
+            if entry is not None:
+                entry_depth, bound, value, tt_move = entry
+                # Root is always searched, as it has to determine the best child. Leaves are valuated for the player to move,
+                # so only results of searches ending with the same player to move are comparable.
+                if self.parent is not None and entry_depth >= depth and (entry_depth - depth) % 2 == 0:
+                    if bound == Bound.EXACT:
+                        return value
+                    if bound == Bound.LOWER and value >= self.__beta:
+                        return self.__beta
+                    if bound == Bound.UPPER and value <= self.__alpha:
+                        return self.__alpha
+
         if not self.state.can_move():
             self.state.change_color()
 
         is_max_node = self.state.current_color == self.player_color
-        for col, row, move_color in self.state.get_legal_actions():
-            board, color = self.state.move(col, row)
-            child_node = AlphaBetaNode(AlphaBetaState(board, color), self.player_color, self.__max_depth, self.__alpha, self.__beta, self, [col, row, move_color])
-            child_result = child_node.valuate()
+        alpha, beta = self.__alpha, self.__beta
+        result = None
+        cutoff_action = None
+        actions = self.state.get_legal_actions()
+        if self.move_ordering is not None:
+            actions = self.move_ordering.order(actions, self.level, tt_move)
+        elif tt_move in actions:
+            actions.remove(tt_move)
+            actions.insert(0, tt_move)
+        for index, action in enumerate(actions):
+            if index == 0 or self.move_ordering is None:
+                child_node, child_result = self.__valuate_child(action, self.__alpha, self.__beta)
+            elif is_max_node:
+                # Null window only checks if the move is better than the best one found so far, it is searched again with full window only if it is
+                child_node, child_result = self.__valuate_child(action, self.__alpha, self.__alpha + 1)
+                if self.__alpha < child_result < self.__beta:
+                    child_node, child_result = self.__valuate_child(action, self.__alpha, self.__beta)
+            else:
+                child_node, child_result = self.__valuate_child(action, self.__beta - 1, self.__beta)
+                if self.__alpha < child_result < self.__beta:
+                    child_node, child_result = self.__valuate_child(action, self.__alpha, self.__beta)
             if is_max_node:
                 if child_result > self.__alpha:
                     self.__alpha = child_result
                     self.best_child = child_node
                 if self.__alpha >= self.__beta:
-                    return self.__beta
+                    result = self.__beta
+                    cutoff_action = action
+                    break
             else:
                 if child_result < self.__beta:
                     self.__beta = child_result
                     self.best_child = child_node
                 if self.__beta <= self.__alpha:
-                    return self.__alpha
+                    result = self.__alpha
+                    cutoff_action = action
+                    break
+
+        if cutoff_action is not None:
+            self.root.cutoffs_count += 1
+            if self.move_ordering is not None:
+                self.move_ordering.add_cutoff(cutoff_action, self.level, depth)
 
-        return self.__alpha if is_max_node else self.__beta
+        if result is None:
+            result = self.__alpha if is_max_node else self.__beta
+        if key is not None:
+            self.transposition_table.store(key, depth, self.__get_bound(result, alpha, beta), result, self.__get_best_move())
+        return result
 
     def is_terminal_node(self) -> bool:
         return self.level + 1 >= self.__max_depth or super().is_terminal_node()
 
+    def __valuate_child(self, action: tuple[int, int, PlayerColor], alpha: int, beta: int) -> tuple["AlphaBetaNode", int]:
+        col, row, move_color = action
+        board = self.state.board
+        board.make_move(col, row, move_color)
+        child_node = AlphaBetaNode(AlphaBetaState(board, PlayerColor(-move_color.value)), self.player_color, self.__max_depth, alpha, beta, self, [col, row, move_color],
+                                   self.transposition_table, self.deadline, self.move_ordering, self.stop_event)
+        try:
+            return child_node, child_node.valuate()
+        finally:
+            # Board is restored also when search is interrupted
+            board.undo_move()
+
+    def __get_bound(self, result: int, alpha: int, beta: int) -> Bound:
+        # Search returns bound of the window, if real value of the position lies outside of the window given by parent
+        if result <= alpha:
+            return Bound.UPPER
+        if result >= beta:
+            return Bound.LOWER
+        return Bound.EXACT
+
+    def __get_best_move(self) -> tuple[int, int, PlayerColor]:
+        if self.best_child is None:
+            return None
+        col, row, move_color = self.best_child.parent_action
+        return (col, row, move_color)
+
 class GroupingGraphNode(MCTSNode):
     '''
     Class representing a node in a tree (graph) for MCTS modification using grouping of identical states.
     '''
-    def __init__(self, state: GroupingGraphState, color: PlayerColor, state_dict, seed: int = 10, parent: "GroupingGraphNode" = None, parent_action: tuple[int, int, PlayerColor] = None):
-        super().__init__(state, color, seed, parent, parent_action)
+    # Statistics of children are read from their grouped states, which can be updated through other parents
+    _has_children_arrays = False
+
+    def __init__(self, state: State, color: PlayerColor, state_dict, seed: int = 10, parent: "GroupingGraphNode" = None, parent_action: tuple[int, int, PlayerColor] = None,
+                 grouped_state: GroupingGraphState = None, rollouts_per_leaf: int = 1):
+        super().__init__(state, color, seed, parent, parent_action, rollouts_per_leaf=rollouts_per_leaf)
         self.state = state
         self.parent = parent
         self.state_dictionary = state_dict
+        self.grouped_state = grouped_state if grouped_state is not None else GroupingGraphState(state.board, state.current_color)
 
     def valuate(self) -> int:
         '''
         Returns a difference between the amount of wins and losses
         '''
-        wins = self.state.results[1]
-        loses = self.state.results[-1]
+        wins = self.grouped_state.results[1]
+        loses = self.grouped_state.results[-1]
         return wins - loses
 
     def n(self) -> int:
         '''
         Returns an amount of times the node was visited
         '''
-        return self.state.number_of_visits
+        return self.grouped_state.number_of_visits
 
     def _expand(self) -> "GroupingGraphNode":
         '''
         Expands the three towards a random unexplored child
+        Move is made in place on the shared board, so the board is left in child's position.
+        Statistics are kept in a state shared by all nodes whose boards are identical up to rotations and reflections, found in the dictionary by canonical key.
         '''
         col, row, move_color = self._untried_actions.pop()
-        board, color= self.state.move(col, row)
-        state = GroupingGraphState(board, color)
-        state_to_str = state.to_string()
+        self.state.board.make_move(col, row, move_color)
+        state = GroupingGraphState(self.state.board, PlayerColor(-move_color.value))
 
-        if state.check_if_in_dictionary(self.state_dictionary):
-            state = self.state_dictionary[state.to_string()]
+        state_key = state.get_key()
+        if state_key in self.state_dictionary:
+            state = self.state_dictionary[state_key]
         else:
-            self.state_dictionary[state_to_str] = state
+            self.state_dictionary[state_key] = state
 
-        child_node = GroupingGraphNode(state, self.player_color, self.state_dictionary, parent=self, parent_action=(col, row, move_color))
+        child_node = GroupingGraphNode(State(self.state.board, PlayerColor(-move_color.value)), self.player_color, self.state_dictionary,
+                                       parent=self, parent_action=(col, row, move_color), grouped_state=state, rollouts_per_leaf=self.rollouts_per_leaf)
         self._children.append(child_node)
         return child_node
 
 
-    def _backpropagate(self, result: int) -> None:
+    def _backpropagate_results(self, results: dict[int, int]) -> None:
         '''
-        Backpropagates through visited nodes and updates statistics
+        Backpropagates number of each result of one or more rollouts through visited nodes and updates statistics, in a single loop up to the root.
+        Nodes are followed by their parents, so only the path of the iteration is updated, even if a grouped state is shared with nodes of other paths.
+        Each grouped state is updated once, as the number of pawns grows with each move of the path, so a state cannot appear on it twice.
         '''
-        if self.state.current_color != self.player_color:
-            result = -result
-        self.state.number_of_visits += 1.
-        self.state.results[result] += 1.
-        if self.parent:
-            self.parent._backpropagate(result)
+        wins, draws, losses = results.get(1, 0), results.get(0, 0), results.get(-1, 0)
+        node = self
+        while node is not None:
+            if node.state.current_color != node.player_color:
+                wins, losses = losses, wins
+            grouped_state = node.grouped_state
+            grouped_state.number_of_visits += wins + draws + losses
+            grouped_state.results[1] += wins
+            grouped_state.results[0] += draws
+            grouped_state.results[-1] += losses
+            node = node.parent
+
+    def _update_statistics(self, result: int, count: float) -> None:
+        '''
+        Adds \"count\" visits with specified \"result\" to statistics of the node. Negative count removes them.
+        '''
+        self.grouped_state.number_of_visits += count
+        self.grouped_state.results[result] += count
+
+    def _best_child(self, c_param=1) -> "GroupingGraphNode":
+        '''
+        Returns the most promising child using UCT formula.
+        Statistics of children are read from their grouped states one by one, as they can be updated through other parents, so they are not kept in arrays.
+        '''
+        choices_weights = [(c.valuate() / c.n()) + c_param * np.sqrt((np.log(self.n()) / c.n())) for c in self._children]
+        return self._children[np.argmax(choices_weights)]
+
+    def _best_child_simple(self) -> "GroupingGraphNode":
+        '''
+        Returns the best child using simple formula
+        '''
+        choices_weights = [(c.valuate() / c.n())  for c in self._children]
+        return self._children[np.argmax(choices_weights)]
+
+def simulate(board: Board, color: PlayerColor, player_color: PlayerColor, seed: int, rollouts_per_leaf: int) -> dict[int, int]:
+    '''
+    Simulates random games from position on the \"board\" with player of specified \"color\" moving first and returns number of each result for player with \"player_color\".
+    Used by worker processes in tree parallelization.
+    '''
+    node = MCTSNode(State(board, color), player_color, seed, rollouts_per_leaf=rollouts_per_leaf)
+    if rollouts_per_leaf > 1:
+        return node._batch_rollout()
+    return {node._rollout(): 1}
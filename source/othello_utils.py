@@ -1,4 +1,5 @@
 from enum import Enum, auto
+from random import Random
 
 HEURISTIC_WEIGHTS = [[120, -20,  20,  5,  5,  20, -20, 120],
                     [-20, -40,  -5, -5, -5,  -5, -30, -20],
@@ -37,9 +38,86 @@ class MCTSVersion(Enum):
     UCB1_TUNED = auto()
     UCT_GROUPING = auto()
 
+class ParallelMode(Enum):
+    '''
+    Implemented ways of running MCTS search in multiple worker processes
+    '''
+    ROOT = "root"
+    TREE = "tree"
+
+class TreeStorage(Enum):
+    '''
+    Implemented ways of storing MCTS tree.
+    '''
+    OBJECTS = "objects"
+    ARRAYS = "arrays"
+
+class SearchType(Enum):
+    '''
+    Implemented cores of alpha-beta search used by heuristic player.
+    '''
+    RECURSIVE = "recursive"
+    TREE = "tree"
+
+class BoardType(Enum):
+    '''
+    Implemented representations of the board used by bots for searching next moves.
+    '''
+    LIST = "list"
+    BITBOARD = "bitboard"
+
 def rotated(array_2d: list[list[int]]) -> list[list[int]]:
     '''
     Returns rotated copy of "\array_2d\".
     '''
     list_of_tuples = zip(*array_2d[::-1])
     return [list(elem) for elem in list_of_tuples]
+
+# Each symmetry of the board (rotations and reflections) maps (col, row)-coordinates of a field to coordinates of its image
+SYMMETRIES = [
+    lambda col, row: (col, row),
+    lambda col, row: (7 - row, col),
+    lambda col, row: (7 - col, 7 - row),
+    lambda col, row: (row, 7 - col),
+    lambda col, row: (7 - col, row),
+    lambda col, row: (col, 7 - row),
+    lambda col, row: (row, col),
+    lambda col, row: (7 - row, 7 - col),
+]
+ZOBRIST_LANE_BITS = 64
+ZOBRIST_LANE_MASK = (1 << ZOBRIST_LANE_BITS) - 1
+
+def _create_zobrist_keys() -> dict[int, list[int]]:
+    # Keys of all 8 symmetric images of a pawn are packed into single integer, lane i holding key of the pawn transformed by SYMMETRIES[i].
+    # Hashes of all symmetric images of the board are then updated with a single xor per changed field.
+    random = Random(20220523)
+    base_keys = {value: [random.getrandbits(ZOBRIST_LANE_BITS) for _ in range(64)] for value in (-1, 1)}
+    keys = {value: [0] * 64 for value in (-1, 1)}
+    for value in (-1, 1):
+        for col in range(8):
+            for row in range(8):
+                for i, symmetry in enumerate(SYMMETRIES):
+                    image_col, image_row = symmetry(col, row)
+                    keys[value][col * 8 + row] |= base_keys[value][image_col * 8 + image_row] << (i * ZOBRIST_LANE_BITS)
+    return keys
+
+# Zobrist keys of pawns by color value and field index (col * 8 + row) and keys for flipping pawn on the field to the other color
+ZOBRIST_KEYS = _create_zobrist_keys()
+ZOBRIST_FLIP_KEYS = [ZOBRIST_KEYS[-1][i] ^ ZOBRIST_KEYS[1][i] for i in range(64)]
+
+def get_zobrist_hash(field: list[list[int]]) -> int:
+    '''
+    Returns packed Zobrist hashes of all symmetric images of \"field\", calculated from scratch.
+    '''
+    zobrist_hash = 0
+    for col, column in enumerate(field):
+        for row, value in enumerate(column):
+            if value != 0:
+                zobrist_hash ^= ZOBRIST_KEYS[value][col * 8 + row]
+    return zobrist_hash
+
+def get_canonical_key(zobrist_hash: int) -> int:
+    '''
+    Returns key identical for all symmetric images of the board with packed Zobrist hashes \"zobrist_hash\".
+    '''
+    return min((zobrist_hash >> (i * ZOBRIST_LANE_BITS)) & ZOBRIST_LANE_MASK for i in range(len(SYMMETRIES)))
@@ -1,15 +1,36 @@
+import cProfile
 from abc import abstractmethod
 from random import Random
+from threading import Event
+from timeit import default_timer as timer
 
+from bitboard import convert_board
 from board import Board
-from othello_utils import PlayerColor
+from othello_utils import BoardType, PlayerColor
 
 class Player:
     '''
     Base class representing a player and providing interface for fetching their next move.
+    Bots may be limited by time of a single move and by total time of all their moves in the game.
+    Search of a bot running in another thread can be stopped with \"stop\" method.
+    Bots may also search on the opponent's time with \"ponder\" method.
+    Statistics of each found move are collected by the move clock and can be fetched with \"pop_move_statistics\" method.
+    Statistics that are costly to collect are added only if telemetry is enabled with \"enable_telemetry\" method.
     '''
-    def __init__(self, color: PlayerColor) -> None:
+    def __init__(self, color: PlayerColor, board_type: BoardType = BoardType.LIST, move_time_ms: int = None, game_time_ms: int = None) -> None:
         self.color = color
+        self.board_type = board_type
+        self.move_time_ms = move_time_ms
+        self.game_time_ms = game_time_ms
+        self.__used_time_ms = 0
+        self.__move_start = None
+        self.__moves_count = 0
+        self.__move_statistics = []
+        self.__profiled_move = None
+        self.__profile_file = None
+        self.__profiler = None
+        self._is_telemetry_enabled = False
+        self._stop_event = Event()
 
     def __str__(self) -> str:
         return f'{type(self).__name__} ({self.color.name.lower()})'
@@ -22,6 +43,109 @@ class Player:
         '''
         raise NotImplementedError('Mehtod cannot be called from abstract class')
 
+    def ponder(self, board_copy: Board, stop_event: Event) -> None:
+        '''
+        Searches position on "board_copy" with the opponent to move, until the search is completed or "stop_event" is set.
+        Results of the search are reused by the next call of "get_next_move". Player does nothing by default.
+        This method is allowed to edit "board_copy", copying has to be handled before calling this method.
+        '''
+
+    def get_search_report(self) -> str:
+        '''
+        Returns summary of player's search performance to be printed after the game or None if there is nothing to report.
+        '''
+        return None
+
+    def pop_move_statistics(self) -> list[dict]:
+        '''
+        Returns statistics of moves found since the previous call, one dictionary per move.
+        Each contains player's name, color, number of the move and its wall time in milliseconds, followed by statistics of the search specific to the player.
+        '''
+        move_statistics = self.__move_statistics
+        self.__move_statistics = []
+        return move_statistics
+
+    def enable_telemetry(self) -> None:
+        '''
+        Adds statistics of the search that require additional work, such as walking the whole tree, to statistics of each move.
+        '''
+        self._is_telemetry_enabled = True
+
+    def enable_profiling(self, move_number: int, file_name: str) -> None:
+        '''
+        Profiles search of player's move with specified \"move_number\" (counted from 1) with cProfile and saves statistics to \"file_name\", readable by pstats module.
+        Only the thread searching the move is profiled, so searches run by worker processes are not included.
+        '''
+        self.__profiled_move = move_number
+        self.__profile_file = file_name
+
+    def stop(self) -> None:
+        '''
+        Requests the player to stop searching for the next move as soon as possible. Move returned by interrupted search should not be used.
+        '''
+        self._stop_event.set()
+
+    def close(self) -> None:
+        '''
+        Releases resources used by the player, such as worker processes. Called after the game is finished.
+        '''
+
+    def __getstate__(self) -> dict:
+        # Event cannot be sent to other processes, new one is created after unpickling
+        state = self.__dict__.copy()
+        del state['_stop_event']
+        state['_Player__move_statistics'] = []
+        state['_Player__profiler'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._stop_event = Event()
+
+    def _start_move_clock(self, board_copy: Board) -> float:
+        '''
+        Starts measuring time of current move and returns deadline (value of timer) for finding it or None if time is not limited.
+        Remaining game time is split equally between estimated number of player's remaining moves.
+        '''
+        self.__moves_count += 1
+        if self.__moves_count == self.__profiled_move:
+            self.__profiler = cProfile.Profile()
+            self.__profiler.enable()
+        self.__move_start = timer()
+        budget_ms = self.move_time_ms
+        if self.game_time_ms is not None:
+            empty_fields = board_copy.ROWS * board_copy.COLS - board_copy.points[PlayerColor.BLACK] - board_copy.points[PlayerColor.WHITE]
+            remaining_moves = max((empty_fields + 1) // 2, 1)
+            game_budget_ms = max(self.game_time_ms - self.__used_time_ms, 0) / remaining_moves
+            budget_ms = game_budget_ms if budget_ms is None else min(budget_ms, game_budget_ms)
+        return None if budget_ms is None else self.__move_start + budget_ms / 1000
+
+    def _stop_move_clock(self, search_statistics: dict = None) -> None:
+        '''
+        Stops measuring time of current move, adding it to time used in the game. Statistics of the move are stored together with \"search_statistics\".
+        '''
+        move_time_ms = 1000 * (timer() - self.__move_start)
+        self.__used_time_ms += move_time_ms
+        self._stop_profiling()
+        self.__move_statistics.append({'player': str(self), 'color': self.color.name.lower(), 'move': self.__moves_count, 'time_ms': move_time_ms,
+                                       **(search_statistics or {})})
+
+    def _stop_profiling(self) -> None:
+        '''
+        Saves profile of current move, if it is profiled. Called by \"_stop_move_clock\" and also when search of the move fails,
+        so the profiler is not left enabled. Does nothing if profile was already saved.
+        '''
+        if self.__profiler is not None:
+            self.__profiler.disable()
+            self.__profiler.dump_stats(self.__profile_file)
+            self.__profiler = None
+
+    def _prepare_board(self, board_copy: Board) -> Board:
+        '''
+        Returns \"board_copy\" converted to representation of the board configured for the player.
+        '''
+        return convert_board(board_copy, self.board_type)
+
 class UserPlayer(Player):
     '''
     Class representing a player controlled by real person using mouse. Fetching next move not supported.
@@ -33,11 +157,13 @@ class RandomPlayer(Player):
     '''
     Class representing a player performing random moves.
     '''
-    def __init__(self, color: PlayerColor, seed: int) -> None:
-        super().__init__(color)
+    def __init__(self, color: PlayerColor, seed: int, board_type: BoardType = BoardType.LIST) -> None:
+        super().__init__(color, board_type)
         self.__random = Random(seed)
 
     def get_next_move(self, board_copy: Board) -> tuple[int, int]:
-        moves = board_copy.get_legal_actions(self.color)
+        self._start_move_clock(board_copy)
+        moves = self._prepare_board(board_copy).get_legal_actions(self.color)
         col, row = moves[self.__random.randint(0, len(moves) - 1)]
+        self._stop_move_clock()
         return (col, row)
@@ -1,4 +1,3 @@
-import copy
 from collections import defaultdict
 from board import Board
 from othello_utils import HEURISTIC_WEIGHTS, PlayerColor
@@ -10,6 +9,7 @@ class State:
     def __init__(self, board: Board, color: PlayerColor):
         self.current_color = color
         self.board = board
+        self.__color_history = []
 
     def is_game_over(self):
         '''
@@ -35,14 +35,23 @@ class State:
         '''
         return [(col, row, self.current_color) for (col, row) in self.board.get_legal_actions(self.current_color)]
 
-    def move(self, col, row):
+    def make_move(self, col, row) -> bool:
         '''
-        Performs a specified move on a copy of board and returns the copy and color of next moving player.
+        Performs a specified move in place on the board and passes the turn to the other player.
+        Move can be reverted with undo_move method. Returns true if move was possible or false if it was illegal.
         '''
-        board_copy = copy.deepcopy(self.board)
-        board_copy.move(col, row, self.current_color)
-        board_copy.refresh_result()
-        return board_copy, PlayerColor(-self.current_color.value)
+        if not self.board.make_move(col, row, self.current_color):
+            return False
+        self.__color_history.append(self.current_color)
+        self.current_color = PlayerColor(-self.current_color.value)
+        return True
+
+    def undo_move(self) -> None:
+        '''
+        Reverts the last move done with make_move method, restoring the board and color of moving player.
+        '''
+        self.board.undo_move()
+        self.current_color = self.__color_history.pop()
 
     def game_result(self, player_color: PlayerColor) -> int:
         '''
@@ -59,11 +68,7 @@ class State:
         '''
         Returns stringfied state.
         '''
-        ret_str = ''
-        field = self.board.get_field()
-        for i in range(self.board.COLS):
-            ret_str = ret_str.join(str(e) for e in field[i])
-        return ret_str
+        return ''.join(str(value) for column in self.board.get_field() for value in column)
 
 class AlphaBetaState(State):
     '''
@@ -102,16 +107,8 @@ class GroupingGraphState(State):
         self.board.rotate_board()
         return self
 
-    def check_if_in_dictionary(self, dictionary: dict) -> bool:
-        '''
-        Checks if the state is already added to specified \"dictionary\".
-        '''
-        if self.to_string() in dictionary:
-            return True
-        elif self.rotate_board().to_string() in dictionary:
-            return True
-        elif self.rotate_board().to_string() in dictionary:
-            return True
-        elif self.rotate_board().to_string() in dictionary:
-            return True
-        return False
+    def get_key(self) -> int:
+        '''
+        Returns key of the state in dictionary of grouped states, identical for all rotations and reflections of the board.
+        '''
+        return self.board.get_canonical_key()
@@ -0,0 +1,81 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from timeit import default_timer as timer
+from typing import Generator, Iterator
+from headless_game import HeadlessGame
+from match import Match
+from player import UserPlayer
+
+def play_match_games(match: Match, show_visualization: bool, ponder: bool = False, profile_move: int = None,
+                     profile_prefix: str = 'profile', telemetry: bool = False) -> Generator[tuple[list[str], list[str], list[dict]], None, None]:
+    '''
+    Plays games of the \"match\" one by one, until one of the players wins it. Bots ponder on the opponent's time if \"ponder\" is set, but only in visualized games.
+    Yields lines of report to be printed to console, rows for the output file and statistics of all moves of bots, as soon as each game is finished.
+    If \"profile_move\" is set, search of this move of each bot is profiled and saved to file starting with \"profile_prefix\".
+    If \"telemetry\" is set, statistics of moves include also those costly to collect, such as size of MCTS tree.
+    '''
+    player_names = match.player_names
+    for j, players in enumerate(match.get_games()):
+        report, rows, move_statistics = [], [], []
+        if telemetry:
+            for player in players:
+                player.enable_telemetry()
+        if profile_move is not None:
+            for player in players:
+                player.enable_profiling(profile_move, f'{profile_prefix}-game{j + 1}-{player.color.name.lower()}.prof')
+        if show_visualization or any(isinstance(player, UserPlayer) for player in players):
+            # Game with visualization is imported only when needed, so processes playing headless games start faster
+            # pylint: disable=import-outside-toplevel
+            from othello_game import OthelloGame
+            game = OthelloGame(players, show_visualization, ponder=ponder)
+        else:
+            game = HeadlessGame(players)
+        time_start = timer()
+        if not game.run_game():
+            result = game.get_result()
+            times = game.get_times()
+            match.add_game_result(j, result)
+            report.append(f'Game result ({players[0].color.name} - {players[1].color.name}): {match.results[-1][0]} - {match.results[-1][1]}')
+            report.append(f'Game time: {1000 * (timer() - time_start)} ({times[players[0].color]} s vs {times[players[1].color]})')
+            rows.append(f'{player_names[0]},{players[0].color.name.lower()},{match.results[-1][0]},{player_names[1]},{players[1].color.name.lower()},{match.results[-1][1]}\n')
+        for player in players:
+            search_report = player.get_search_report()
+            if search_report is not None:
+                report.append(search_report)
+            move_statistics.extend({'game': j + 1, **statistics} for statistics in player.pop_move_statistics())
+            player.close()
+        yield report, rows, move_statistics
+
+def play_match(match: Match, show_visualization: bool, ponder: bool = False, profile_move: int = None,
+               profile_prefix: str = 'profile', telemetry: bool = False) -> tuple[Match, list[str], list[str], list[dict]]:
+    '''
+    Plays all games of the \"match\" with \"play_match_games\" and returns the match with results of games, together with joined reports, rows and statistics of all games.
+    Used by worker processes, which send results back only after the whole match.
+    '''
+    report, rows, move_statistics = [], [], []
+    for game_report, game_rows, game_move_statistics in play_match_games(match, show_visualization, ponder, profile_move, profile_prefix, telemetry):
+        report.extend(game_report)
+        rows.extend(game_rows)
+        move_statistics.extend(game_move_statistics)
+    return match, report, rows, move_statistics
+
+def play_matches(matches: list[Match], show_visualization: bool, workers: int = 1, ponder: bool = False, profile_move: int = None,
+                 profile_prefix: str = 'profile', telemetry: bool = False
+                 ) -> Generator[tuple[Match, Iterator[tuple[list[str], list[str], list[dict]]]], None, None]:
+    '''
+    Yields all \"matches\" in the same order, each with iterator over results of its games, as yielded by \"play_match_games\".
+    Matches are played one by one and each game is played only when its result is fetched, so results of games are available as soon as they are finished.
+    Iterator of games has to be exhausted before fetching the next match.
+    If more than one worker is configured and games are not visualized, matches are played concurrently in separate processes.
+    Results of all games of such match are then joined into a single entry, available after the whole match.
+    '''
+    profile_prefixes = [f'{profile_prefix}-match{i + 1}' for i in range(len(matches))]
+    if workers <= 1 or show_visualization or any(match.has_user_player() for match in matches):
+        for match, match_profile_prefix in zip(matches, profile_prefixes):
+            yield match, play_match_games(match, show_visualization, ponder, profile_move, match_profile_prefix, telemetry)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        for match, report, rows, move_statistics in executor.map(play_match, matches, repeat(show_visualization), repeat(ponder), repeat(profile_move),
+                                                                  profile_prefixes, repeat(telemetry)):
+            yield match, iter([(report, rows, move_statistics)])
@@ -0,0 +1,59 @@
+from enum import Enum, auto
+from random import Random
+from othello_utils import PlayerColor
+
+# Zobrist key of the player to move, combined with hash of the board to distinguish the same boards with different players to move
+WHITE_TO_MOVE_KEY = Random(20220524).getrandbits(64)
+
+class Bound(Enum):
+    '''
+    Relation between value stored in transposition table and real value of the position.
+    '''
+    EXACT = auto()
+    LOWER = auto()
+    UPPER = auto()
+
+class TranspositionTable:
+    '''
+    Bounded table with results of already searched positions, keyed by hash of the position and player to move.
+    When the table is full, the oldest entry is replaced.
+    '''
+    def __init__(self, max_size: int = 100000) -> None:
+        self.max_size = max_size
+        self.__entries = {}
+
+    @staticmethod
+    def get_key(zobrist_hash: int, color: PlayerColor) -> int:
+        '''
+        Returns key of the position with \"zobrist_hash\" and player with \"color\" to move.
+        '''
+        return zobrist_hash ^ WHITE_TO_MOVE_KEY if color == PlayerColor.WHITE else zobrist_hash
+
+    def lookup(self, key: int) -> tuple[int, Bound, int, tuple[int, int, PlayerColor]]:
+        '''
+        Returns depth, bound type, value and best move stored for position with \"key\" or None if position was not searched.
+        '''
+        return self.__entries.get(key)
+
+    def store(self, key: int, depth: int, bound: Bound, value: int, best_move: tuple[int, int, PlayerColor]) -> None:
+        '''
+        Stores result of searching position with \"key\" to specified \"depth\".
+        Entry searched to a greater depth is not replaced.
+        '''
+        entry = self.__entries.get(key)
+        if entry is not None:
+            if entry[0] > depth:
+                return
+            del self.__entries[key]
+        elif len(self.__entries) >= self.max_size:
+            del self.__entries[next(iter(self.__entries))]
+        self.__entries[key] = (depth, bound, value, best_move)
+
+    def clear(self) -> None:
+        '''
+        Removes all entries from the table.
+        '''
+        self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)